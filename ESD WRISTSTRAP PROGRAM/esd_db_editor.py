@@ -25,11 +25,26 @@ def open_conn(path=DB_PATH):
     return conn
 
 
-def detect_columns(conn):
-    cur = conn.cursor()
-    cur.execute("PRAGMA table_info(esd_data)")
-    cols = [r[1] for r in cur.fetchall()]
-    return cols
+# esd_data column names per DB path, so the (network) DB is only asked once
+_SCHEMA_CACHE = {}
+
+
+def detect_columns(conn, path=DB_PATH):
+    cols = _SCHEMA_CACHE.get(path)
+    if cols is None:
+        cur = conn.cursor()
+        cur.execute("PRAGMA table_info(esd_data)")
+        cols = [r[1] for r in cur.fetchall()]
+        _SCHEMA_CACHE[path] = cols
+    return list(cols)
+
+
+def refresh_schema(path=None):
+    """Forget cached columns (all paths if `path` is None), e.g. after a column is added."""
+    if path is None:
+        _SCHEMA_CACHE.clear()
+    else:
+        _SCHEMA_CACHE.pop(path, None)
 
 
 class ESDEditor(tk.Tk):
@@ -46,7 +61,17 @@ class ESDEditor(tk.Tk):
             self.destroy()
             return
 
-        self.cols = detect_columns(self.conn)
+        self.cols = detect_columns(self.conn, self.db_path)
+
+        # Guess timestamp column name
+        self.ts_col = next((c for c in self.cols if 'time' in c.lower() or 'date' in c.lower()), None)
+
+        # Query fragments that only depend on the schema; refresh() just adds the WHERE
+        select_cols = ', '.join(f'"{c}"' for c in self.cols) if self.cols else '*'
+        self.base_select = f"SELECT {select_cols} FROM esd_data"
+        self.order_suffix = " ORDER BY " + (self.ts_col or 'rowid') + " DESC LIMIT 1000"
+        # Unfiltered query is the common case; build it once
+        self._stmt_no_filter = self.base_select + self.order_suffix
 
         # UI
         top = ttk.Frame(self)
@@ -86,35 +111,30 @@ class ESDEditor(tk.Tk):
         for r in self.tree.get_children():
             self.tree.delete(r)
 
-        q = "SELECT * FROM esd_data"
-        params = []
-        w = []
         name = self.filter_name.get().strip()
-        if name:
-            # search anywhere in name
-            w.append("emp_name LIKE ?")
-            params.append(f"%{name}%")
-
         date_from = self.filter_from.get().strip()
         date_to = self.filter_to.get().strip()
-        # Guess timestamp column name
-        ts_col = None
-        for c in self.cols:
-            if 'time' in c.lower() or 'date' in c.lower():
-                ts_col = c
-                break
-
-        if date_from and ts_col:
-            w.append(f"DATE({ts_col}) >= ?")
-            params.append(date_from)
-        if date_to and ts_col:
-            w.append(f"DATE({ts_col}) <= ?")
-            params.append(date_to)
-
-        if w:
-            q += " WHERE " + " AND ".join(w)
-
-        q += " ORDER BY "+ (ts_col or 'rowid') + " DESC LIMIT 1000"
+        ts_col = self.ts_col
+
+        if not (name or (ts_col and (date_from or date_to))):
+            q = self._stmt_no_filter
+            params = []
+        else:
+            params = []
+            w = []
+            if name:
+                # search anywhere in name
+                w.append("emp_name LIKE ?")
+                params.append(f"%{name}%")
+
+            if date_from and ts_col:
+                w.append(f"DATE({ts_col}) >= ?")
+                params.append(date_from)
+            if date_to and ts_col:
+                w.append(f"DATE({ts_col}) <= ?")
+                params.append(date_to)
+
+            q = self.base_select + " WHERE " + " AND ".join(w) + self.order_suffix
 
         cur = self.conn.cursor()
         try:
@@ -124,9 +144,9 @@ class ESDEditor(tk.Tk):
             return
 
         rows = cur.fetchall()
+        # The SELECT projects self.cols in order, matching the tree columns
         for row in rows:
-            vals = [row[c] if c in row.keys() else '' for c in self.tree['columns']]
-            self.tree.insert('', 'end', values=vals)
+            self.tree.insert('', 'end', values=tuple(row))
 
         self.status.config(text=f'Showing {len(rows)} rows (limited to 1000)')
 
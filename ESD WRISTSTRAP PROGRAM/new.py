@@ -1,28 +1,82 @@
+import ctypes
+import sys
+from ctypes import wintypes
+
 import psutil
  
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+ 
+ 
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * 260),
+    ]
+ 
+ 
+def _iter_process_names():
+    """Yield (pid, exe name) for every process from one Toolhelp snapshot (psutil off Windows)."""
+    if sys.platform != "win32":
+        for proc in psutil.process_iter(['name']):
+            yield proc.pid, proc.info['name'] or ""
+        return
+ 
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+ 
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot is None or snapshot == INVALID_HANDLE_VALUE:
+        return
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while ok:
+            yield entry.th32ProcessID, entry.szExeFile
+            ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+ 
+ 
+def _process_cmdline(pid):
+    # Only called for candidate Outlook processes, so at most a few opens per scan
+    try:
+        return " ".join(psutil.Process(pid).cmdline() or [])
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return ""
+ 
+ 
 def check_outlook_running():
     classic_outlook = False
     new_outlook = False
     detected_processes = []
  
-    for proc in psutil.process_iter(['name', 'cmdline']):
-        try:
-            name = proc.info['name']
-            cmdline = " ".join(proc.info['cmdline'] or [])
- 
-            # Classic Outlook
-            if name and name.lower() == "outlook.exe":
-                classic_outlook = True
-                detected_processes.append("Classic Outlook (OUTLOOK.EXE)")
+    for pid, name in _iter_process_names():
+        lname = name.lower()
  
-            # New Outlook indicators
-            if name and name.lower() in ("olk.exe", "msedgewebview2.exe"):
-                if "outlook" in cmdline.lower():
-                    new_outlook = True
-                    detected_processes.append(f"New Outlook ({name})")
+        # Classic Outlook
+        if lname == "outlook.exe":
+            classic_outlook = True
+            detected_processes.append("Classic Outlook (OUTLOOK.EXE)")
  
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+        # New Outlook indicators
+        elif lname in ("olk.exe", "msedgewebview2.exe"):
+            if "outlook" in _process_cmdline(pid).lower():
+                new_outlook = True
+                detected_processes.append(f"New Outlook ({name})")
  
     return classic_outlook, new_outlook, detected_processes
  
@@ -8,10 +8,22 @@ import sys
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.ticker import FixedLocator
+import matplotlib.lines as mlines
+import numpy as np
 import io
 import tempfile
 import os
 import traceback
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+from ctypes import wintypes
 
 # --- Constants ---
 DB_PATH = r"\\phlsvr08\BMS Data\BMS_Database\ESD_Checker\ESDChecker.db"
@@ -23,6 +35,9 @@ EMAIL_RECIPIENTS_JSON = r"C:\Users\a493353\Desktop\Lans Galos\Raspberry Pi Progr
 DEBUG_SAVE_PNG = False
 DEBUG_SAVE_PATH = r"C:\Temp\esd_chart_debug.png"
 
+# Longest the script waits at exit for queued error emails to reach Outlook
+ERROR_MAIL_WAIT_SEC = 60
+
 recipient_emails = []
 cc_emails = []
 bcc_emails = []
@@ -50,66 +65,222 @@ def load_email_recipients():
 # --------------------------------------------------
 # Outlook Detection (Classic + New Outlook)
 # --------------------------------------------------
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ('dwSize', wintypes.DWORD),
+        ('cntUsage', wintypes.DWORD),
+        ('th32ProcessID', wintypes.DWORD),
+        ('th32DefaultHeapID', ctypes.c_size_t),
+        ('th32ModuleID', wintypes.DWORD),
+        ('cntThreads', wintypes.DWORD),
+        ('th32ParentProcessID', wintypes.DWORD),
+        ('pcPriClassBase', wintypes.LONG),
+        ('dwFlags', wintypes.DWORD),
+        ('szExeFile', wintypes.WCHAR * 260),
+    ]
+
+
+def _iter_process_names():
+    """Yields (pid, exe name) for every process from one Toolhelp snapshot
+    (no per-process OpenProcess). Falls back to psutil off Windows.
+    """
+    if sys.platform != 'win32':
+        for proc in psutil.process_iter(['name']):
+            yield proc.pid, proc.info['name'] or ''
+        return
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot is None or snapshot == INVALID_HANDLE_VALUE:
+        return
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while ok:
+            yield entry.th32ProcessID, entry.szExeFile
+            ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+
+
 def is_outlook_running():
     """
     Detects if the New Outlook app (olk.exe) is currently open.
     """
-    for proc in psutil.process_iter(['name']):
-        try:
-            # 'olk.exe' is the process name for New Outlook
-            if proc.info['name'] and proc.info['name'].lower() == "olk.exe":
-                return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+    for _pid, name in _iter_process_names():
+        # 'olk.exe' is the process name for New Outlook
+        if name.lower() == "olk.exe":
+            return True
     return False
 
 # --------------------------------------------------
 # Email Functions & ESD Chart Utilities
 # --------------------------------------------------
+# Outlook.Application for the main thread, resolved once and shared by both
+# report emails (the error-mail thread keeps its own, COM objects are per-apartment)
+_outlook_app = None
+
+
+def _get_outlook():
+    global _outlook_app
+    if _outlook_app is None:
+        try:
+            # Early-bound proxy from the makepy cache: calls skip IDispatch name lookups
+            _outlook_app = win32com.client.gencache.EnsureDispatch("Outlook.Application")
+        except Exception:
+            _outlook_app = win32com.client.Dispatch("Outlook.Application")
+    return _outlook_app
+
+
+# Error mails are sent from one background thread so a slow Outlook/Exchange
+# submit never blocks the attendance check; errors queue up in order.
+_error_mail_queue = queue.Queue()
+_error_mail_thread = None
+_error_mail_lock = threading.Lock()
+
+
+def _error_mail_worker():
+    import pythoncom
+    pythoncom.CoInitialize()
+    outlook = None
+    try:
+        while True:
+            subject, html, to = _error_mail_queue.get()
+            try:
+                if outlook is None:
+                    outlook = win32com.client.Dispatch("Outlook.Application")
+                mail = outlook.CreateItem(0)
+                mail.Subject = subject
+                mail.HTMLBody = html
+                mail.To = to
+                mail.Importance = 2
+                mail.Send()
+            except Exception as e:
+                print(f"Failed to send error email: {e}")
+            finally:
+                _error_mail_queue.task_done()
+    finally:
+        pythoncom.CoUninitialize()
+
+
 def send_error_email(error_message, context=''):
+    global _error_mail_thread
     if not admin_email:
         return
-    try:
-        outlook = win32com.client.Dispatch("Outlook.Application")
-        mail = outlook.CreateItem(0)
-        mail.Subject = f'[ERROR] Attendance Script Failed - {datetime.datetime.now():%B %d, %Y}'
-        mail.HTMLBody = f"""
+    subject = f'[ERROR] Attendance Script Failed - {datetime.datetime.now():%B %d, %Y}'
+    html = f"""
         <html><body style="font-family:Tahoma;">
         <p><b>Context:</b> {context}</p>
         <pre>{error_message}</pre>
         </body></html>
         """
-        mail.To = admin_email
-        mail.Importance = 2
-        mail.Send()
-    except Exception as e:
-        print(f"Failed to send error email: {e}")
+    _error_mail_queue.put((subject, html, admin_email))
+    with _error_mail_lock:
+        if _error_mail_thread is None:
+            _error_mail_thread = threading.Thread(target=_error_mail_worker, daemon=True)
+            _error_mail_thread.start()
 
 
-def _get_esd_data(days=31):
-    """Fetches ESD wrist and footwear readings for the last `days` days from DB.
-    Returns (dates, wrist_by_emp, shoe_by_emp, skipped_count) or None on failure.
+def wait_for_error_emails(timeout=ERROR_MAIL_WAIT_SEC):
+    """Waits until every queued error email has been handed to Outlook, giving up
+    after `timeout` seconds or as soon as the mail thread has died.
     """
-    try:
-        def _safe_float(x):
-            if x is None:
-                return None
-            if isinstance(x, (int, float)):
-                return float(x)
-            s = str(x).strip()
-            if not s:
-                return None
-            if s.lower() in ('n/a', 'na', 'none', '-', 'nan', 'inf'):
-                return None
-            try:
-                return float(s)
-            except Exception:
-                return None
+    if _error_mail_thread is None:
+        return
+    deadline = time.monotonic() + timeout
+    while _error_mail_queue.unfinished_tasks and _error_mail_thread.is_alive():
+        if time.monotonic() >= deadline:
+            print(f"Gave up waiting for {_error_mail_queue.unfinished_tasks} error email(s).")
+            return
+        time.sleep(0.1)
+
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+# One connection per run, opened on first use. The DB lives on a network share,
+# so the journal mode is left alone (WAL needs shared memory on the same host).
+_db = None
+
+
+def _get_db():
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.execute("PRAGMA temp_store=MEMORY")
+    return _db
+
+
+# esd_data column names, read once per run (the DB lives on a network share)
+_SCHEMA_CACHE = {}
+
+
+def _esd_columns(cursor, path=DB_PATH):
+    cols = _SCHEMA_CACHE.get(path)
+    if cols is None:
         cursor.execute("PRAGMA table_info(esd_data)")
         cols = [r[1] for r in cursor.fetchall()]
+        _SCHEMA_CACHE[path] = cols
+    return cols
+
+
+# DB paths whose index has been checked this run; CREATE INDEX takes a write lock
+# on the shared DB even when the index already exists
+_INDEXED_DBS = set()
+
+
+def _ensure_esd_index(cursor, timestamp_col, name_col, path=DB_PATH):
+    """Creates the (timestamp, name) index used by the date-range query, once per run, if allowed."""
+    if path in _INDEXED_DBS:
+        return
+    _INDEXED_DBS.add(path)
+    try:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_esd_ts ON esd_data({timestamp_col}, {name_col})")
+    except sqlite3.Error:
+        # Read-only share or locked DB: the query still works, just without the index
+        pass
+
+
+# Placeholder readings that should be treated as "no value"
+_NON_NUMERIC_TOKENS = frozenset(('', 'n/a', 'na', 'none', '-', 'nan', 'inf'))
+
+
+@functools.lru_cache(maxsize=8192)
+def _safe_float(x):
+    """Converts a DB cell to float, or None for empty/placeholder/non-numeric values.
+    Cached because the same cell values ('N/A', '', repeated readings) recur a lot.
+    """
+    if x is None:
+        return None
+    if isinstance(x, (int, float)):
+        return float(x)
+    s = x.strip() if isinstance(x, str) else str(x).strip()
+    if s.lower() in _NON_NUMERIC_TOKENS:
+        return None
+    try:
+        return float(s)
+    except Exception:
+        return None
+
+
+def _get_esd_data(days=31):
+    """Fetches ESD wrist and footwear readings for the last `days` days from DB.
+    Returns (dates, names, wrist, shoe, skipped_count, present_today) or None on failure,
+    where dates are sorted datetime.date objects, wrist/shoe are (len(names), len(dates)) arrays of daily averages (NaN = no
+    reading) and present_today is the set of names with any row dated today.
+    """
+    try:
+        cursor = _get_db().cursor()
+        cols = _esd_columns(cursor)
 
         timestamp_col = 'timestamp' if 'timestamp' in cols else next((c for c in cols if 'time' in c.lower()), None)
         name_col = 'emp_name' if 'emp_name' in cols else next((c for c in cols if 'name' in c.lower()), None)
@@ -118,6 +289,9 @@ def _get_esd_data(days=31):
         shoe_col = next((c for c in cols if 'shoe' in c.lower() or 'footwear' in c.lower()), None)
 
         start_date = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime('%Y-%m-%d')
+        today = datetime.datetime.now().strftime('%Y-%m-%d')
+        if timestamp_col and name_col:
+            _ensure_esd_index(cursor, timestamp_col, name_col)
 
         dates_set = set()
         wrist = {}
@@ -125,7 +299,7 @@ def _get_esd_data(days=31):
         skipped = 0
 
         if wrist_col and shoe_col and timestamp_col and name_col:
-            cursor.execute(f"SELECT DATE({timestamp_col}) as dt, {name_col}, {wrist_col}, {shoe_col} FROM esd_data WHERE DATE({timestamp_col}) >= ?", (start_date,))
+            cursor.execute(f"SELECT DATE({timestamp_col}) as dt, {name_col}, {wrist_col}, {shoe_col} FROM esd_data WHERE {timestamp_col} >= ? AND DATE({timestamp_col}) IS NOT NULL", (start_date,))
             rows = cursor.fetchall()
             for dt, name, wv, sv in rows:
                 dates_set.add(dt)
@@ -146,7 +320,7 @@ def _get_esd_data(days=31):
             val_col = next((c for c in cols if c.lower() in ('value', 'reading', 'resistance') or 'value' in c.lower()), None)
             type_col = next((c for c in cols if 'test' in c.lower() or 'type' in c.lower() or 'measurement' in c.lower()), None)
             if val_col and type_col and timestamp_col and name_col:
-                cursor.execute(f"SELECT DATE({timestamp_col}) as dt, {name_col}, {type_col}, {val_col} FROM esd_data WHERE DATE({timestamp_col}) >= ?", (start_date,))
+                cursor.execute(f"SELECT DATE({timestamp_col}) as dt, {name_col}, {type_col}, {val_col} FROM esd_data WHERE {timestamp_col} >= ? AND DATE({timestamp_col}) IS NOT NULL", (start_date,))
                 rows = cursor.fetchall()
                 for dt, name, ttype, val in rows:
                     dates_set.add(dt)
@@ -160,195 +334,69 @@ def _get_esd_data(days=31):
                     elif ttype and ('shoe' in str(ttype).lower() or 'footwear' in str(ttype).lower() or 'shoe' in str(ttype).lower()):
                         shoe.setdefault((name, dt), []).append(fval)
             else:
-                conn.close()
                 return None
 
-        # Average grouped readings and build per-employee dicts
-        wrist_by_emp = {}
-        shoe_by_emp = {}
+        # Attendance comes from the same rows: anyone with a reading dated today
+        present = {row[1] for row in rows if row[0] == today}
+
+        # Average grouped readings into (employee, date) matrices
+        dates = sorted(dates_set)
+        names = sorted({name for name, _ in wrist} | {name for name, _ in shoe})
+        date_idx = {d: j for j, d in enumerate(dates)}
+        name_idx = {n: i for i, n in enumerate(names)}
 
+        wrist_vals = np.full((len(names), len(dates)), np.nan)
+        shoe_vals = np.full((len(names), len(dates)), np.nan)
         for (name, dt), vals in wrist.items():
-            wrist_by_emp.setdefault(name, {})[dt] = sum(vals) / len(vals)
+            wrist_vals[name_idx[name], date_idx[dt]] = sum(vals) / len(vals)
         for (name, dt), vals in shoe.items():
-            shoe_by_emp.setdefault(name, {})[dt] = sum(vals) / len(vals)
+            shoe_vals[name_idx[name], date_idx[dt]] = sum(vals) / len(vals)
 
-        dates = sorted(dates_set)
-        conn.close()
-        return dates, wrist_by_emp, shoe_by_emp, skipped
+        # Hand the charts datetime.date objects (parsed once per day, not per lookup)
+        dates = [datetime.date.fromisoformat(d) for d in dates]
+
+        return dates, names, wrist_vals, shoe_vals, skipped, present
     except Exception:
         send_error_email(traceback.format_exc(), "Getting ESD data")
         return None
 
 
-def _create_esd_plot_image(dates, wrist_by_emp, shoe_by_emp):
-    """Creates a PNG image (bytes) of two rows of small multiple charts (4 columns each)
-    to match the reference style: each row is split into 4 week-like clusters with a combined legend.
-    """
-    try:
-        if not dates:
-            return None
-
-        import matplotlib.dates as mdates
-
-        # Convert date strings to datetime objects
-        try:
-            date_objs = [datetime.datetime.strptime(d, '%Y-%m-%d') for d in dates]
-        except Exception:
-            date_objs = dates
-
-        # Determine number of columns (four clusters) and split dates
-        cols = 4
-        n = len(date_objs)
-        # Split indices into roughly equal chunks
-        chunk_sizes = [(n // cols) + (1 if i < (n % cols) else 0) for i in range(cols)]
-        indices = []
-        start = 0
-        for sz in chunk_sizes:
-            indices.append((start, start + sz))
-            start += sz
-
-        fig, axs = plt.subplots(2, cols, figsize=(14, 9), sharey='row')
-        # leave default figure facecolor
+def _as_date(d):
+    """Normalizes a chart date ('YYYY-MM-DD', datetime or date) to datetime.date."""
+    if isinstance(d, datetime.datetime):
+        return d.date()
+    if isinstance(d, datetime.date):
+        return d
+    return datetime.date.fromisoformat(d)
 
-        BASELINE = 1.0
-        UCL_WRIST = 5
-        UCL_SHOE = 10
 
-        # Find y-limits across all wrist and shoe values to keep consistent scaling per row
-        all_wrist_vals = [v for s in wrist_by_emp.values() for v in s.values()]
-        all_shoe_vals = [v for s in shoe_by_emp.values() for v in s.values()]
-        def compute_ylim(vals, ucl):
-            try:
-                if vals:
-                    ymax = max(max(vals), ucl) * 1.08
-                    return (0, ymax)
-            except Exception:
-                pass
-            return (0, ucl * 1.2)
+def _new_row_figure():
+    """Returns a fresh (Figure, Axes) for one single-row chart.
+    Plain Agg figures stay out of pyplot's global registry, so each rendering
+    thread can own one without locking.
+    """
+    fig = Figure(figsize=(18, 4.8))
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111)
 
-        wrist_ylim = compute_ylim(all_wrist_vals, UCL_WRIST)
-        shoe_ylim = compute_ylim(all_shoe_vals, UCL_SHOE)
-
-        # Plot wrist row (row 0)
-        wrist_handles = {}
-        for col_idx, (sidx, eidx) in enumerate(indices):
-            ax = axs[0, col_idx]
-            seg_dates = date_objs[sidx:eidx]
-            seg_labels = dates[sidx:eidx]
-            for name, series in sorted(wrist_by_emp.items()):
-                y_seg = [series.get(d, float('nan')) for d in seg_labels]
-                # Draw faint baseline where missing
-                isnan = [not (v == v) for v in y_seg]
-                startm = None
-                for i, miss in enumerate(isnan):
-                    if miss and startm is None:
-                        startm = i
-                    if not miss and startm is not None:
-                        ax.plot(seg_dates[startm:i], [BASELINE] * (i - startm), color='#e0e0e0', linewidth=0.6, zorder=0)
-                        startm = None
-                if startm is not None:
-                    ax.plot(seg_dates[startm:len(seg_dates)], [BASELINE] * (len(seg_dates) - startm), color='#e0e0e0', linewidth=0.6, zorder=0)
-
-                # plot actual data with NaNs preserved so lines break
-                line, = ax.plot(seg_dates, y_seg, marker='o', markersize=3, linewidth=0.8, zorder=5) if any(not (v != v) for v in y_seg) else (None,)
-                if line is not None:
-                    wrist_handles.setdefault(name, line)
-
-            # UCL and formatting
-            ax.axhline(UCL_WRIST, color='red', linewidth=2.0, zorder=11)
-            ax.set_ylim(wrist_ylim)
-            ax.grid(True, linestyle='--', alpha=0.4)
-            ax.set_axisbelow(True)
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, max(1, (eidx - sidx) // 3))))
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b'))
-            for lbl in ax.get_xticklabels():
-                lbl.set_rotation(45); lbl.set_ha('right')
-            if col_idx != 0:
-                ax.set_ylabel('')
-            else:
-                ax.set_ylabel('Ohms')
-
-        axs[0, 0].set_title('ESD WRIST STRAP MONITORING', fontweight='bold')
-
-        # Plot shoe row (row 1)
-        shoe_handles = {}
-        for col_idx, (sidx, eidx) in enumerate(indices):
-            ax = axs[1, col_idx]
-            seg_dates = date_objs[sidx:eidx]
-            seg_labels = dates[sidx:eidx]
-            for name, series in sorted(shoe_by_emp.items()):
-                y_seg = [series.get(d, float('nan')) for d in seg_labels]
-                # baseline
-                isnan = [not (v == v) for v in y_seg]
-                startm = None
-                for i, miss in enumerate(isnan):
-                    if miss and startm is None:
-                        startm = i
-                    if not miss and startm is not None:
-                        ax.plot(seg_dates[startm:i], [BASELINE] * (i - startm), color='#e0e0e0', linewidth=0.6, zorder=0)
-                        startm = None
-                if startm is not None:
-                    ax.plot(seg_dates[startm:len(seg_dates)], [BASELINE] * (len(seg_dates) - startm), color='#e0e0e0', linewidth=0.6, zorder=0)
-
-                line, = ax.plot(seg_dates, y_seg, marker='o', markersize=3, linewidth=0.8, zorder=5) if any(not (v != v) for v in y_seg) else (None,)
-                if line is not None:
-                    shoe_handles.setdefault(name, line)
-
-            ax.axhline(UCL_SHOE, color='red', linewidth=2.0, zorder=11)
-            ax.set_ylim(shoe_ylim)
-            ax.grid(True, linestyle='--', alpha=0.4)
-            ax.set_axisbelow(True)
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, max(1, (eidx - sidx) // 3))))
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b'))
-            for lbl in ax.get_xticklabels():
-                lbl.set_rotation(45); lbl.set_ha('right')
-
-        axs[1, 0].set_title('ESD FOOTWEAR MONITORING', fontweight='bold')
-
-        # Build legend from handles
-        combined_handles = []
-        combined_labels = []
-        added = set()
-        for d in (wrist_handles, shoe_handles):
-            for n, h in d.items():
-                if h is not None and n not in added:
-                    combined_handles.append(h)
-                    combined_labels.append(n)
-                    added.add(n)
-        # Add UCL legend entry (create a proxy Line2D)
-        import matplotlib.lines as mlines
-        ucl_line = mlines.Line2D([], [], color='red', linewidth=2)
-        combined_handles.append(ucl_line)
-        combined_labels.append('UCL')
-
-        if combined_handles:
-            fig.legend(combined_handles, combined_labels, loc='lower center', ncol=6, fontsize='small', frameon=False)
-            plt.subplots_adjust(bottom=0.2, hspace=0.6)
-        else:
-            plt.subplots_adjust(bottom=0.12, hspace=0.6)
 
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight', dpi=140)
-        plt.close(fig)
-        buf.seek(0)
-        return buf.read()
-    except Exception:
-        send_error_email(traceback.format_exc(), "Creating ESD plot")
-        return None
+@functools.lru_cache(maxsize=4)
+def _palette(bucket):
+    """Returns an RGBA array of `bucket` colors (20/40/60) from tab20, tab20b and tab20c."""
+    maps = (plt.cm.tab20, plt.cm.tab20b, plt.cm.tab20c)[:bucket // 20]
+    colors = np.vstack([cmap(np.linspace(0, 1, 20)) for cmap in maps])
+    colors.setflags(write=False)
+    return colors
 
 
-def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
-    """Return (wrist_png_bytes, shoe_png_bytes) as two separate single-row images."""
+def _create_esd_plot_images(dates, names, wrist_vals, shoe_vals):
+    """Return (wrist_jpeg_bytes, shoe_jpeg_bytes) as two separate single-row images."""
     try:
         BASELINE = 1.0
         import matplotlib.dates as mdates
-        import numpy as np
 
         # normalize dates from data
-        try:
-            date_objs = [datetime.datetime.strptime(d, '%Y-%m-%d') for d in dates]
-        except Exception:
-            date_objs = dates
+        date_objs = [_as_date(d) for d in dates]
         
         if len(date_objs) == 0:
             return None, None
@@ -379,81 +427,69 @@ def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
         if len(week_groups) == 0:
             return None, None
 
-        def make_row_image(data_by_emp, title, ucl, base_ylim):
-            # Create figure with more height for legend spacing
-            fig, ax = plt.subplots(1, 1, figsize=(18, 4.8))
+        # Map every calendar day to its column in the data matrices once per call
+        # (-1 = no readings that day), so employees are gathered with one fancy-index
+        date_idx = {d: j for j, d in enumerate(date_objs)}
+        all_dates = [dt for week_dates in week_groups for dt in week_dates]
+        cal_cols = np.array([date_idx.get(dt, -1) for dt in all_dates], dtype=np.intp)
+        has_col = cal_cols >= 0
+
+        # Calendar x-axis is shared by both charts: one slot per day, no gaps between
+        # weeks, and the cut points used to split each series into per-week runs
+        x_positions = np.arange(len(all_dates))
+        week_split_idx = np.cumsum([len(week_dates) for week_dates in week_groups])[:-1]
+        # Labelled ticks only on the first day of each week; days get unlabelled minor ticks
+        week_ticks = np.concatenate(([0], week_split_idx))
+        week_labels = [week_dates[0].strftime('%d-%b-%y') for week_dates in week_groups]
+        week_boundaries = week_split_idx - 0.5
+        xs_by_week = np.split(x_positions, week_split_idx)
+
+        def make_row_image(values, title, ucl, base_ylim):
+            # Each task draws on its own figure (pyplot is not thread-safe)
+            fig, ax = _new_row_figure()
             fig.patch.set_facecolor('white')
             ax.set_facecolor('white')
             
             handles = {}
+
+            # Readings laid out on the calendar x-axis (NaN where missing)
+            cal_vals = np.full((len(names), len(all_dates)), np.nan)
+            cal_vals[:, has_col] = values[:, cal_cols[has_col]]
+
+            # Employees (already sorted) with at least one reading in this chart
+            data_by_emp = [(name, cal_vals[i]) for i, name in enumerate(names) if not np.isnan(values[i]).all()]
             
-            # Create a large color palette for unique colors per employee
-            import matplotlib.cm as cm
+            # Unique color per employee: tab20 + tab20b + tab20c for up to 60
             num_employees = len(data_by_emp)
-            # Use tab20 + tab20b + tab20c for up to 60 distinct colors
-            if num_employees <= 20:
-                colors = plt.cm.tab20(np.linspace(0, 1, 20))
-            elif num_employees <= 40:
-                colors1 = plt.cm.tab20(np.linspace(0, 1, 20))
-                colors2 = plt.cm.tab20b(np.linspace(0, 1, 20))
-                colors = np.vstack([colors1, colors2])
-            else:
-                colors1 = plt.cm.tab20(np.linspace(0, 1, 20))
-                colors2 = plt.cm.tab20b(np.linspace(0, 1, 20))
-                colors3 = plt.cm.tab20c(np.linspace(0, 1, 20))
-                colors = np.vstack([colors1, colors2, colors3])
+            colors = _palette(20 if num_employees <= 20 else 40 if num_employees <= 40 else 60)
             
             # Assign colors to employees
             employee_colors = {}
-            for idx, name in enumerate(sorted(data_by_emp.keys())):
+            for idx, (name, _) in enumerate(data_by_emp):
                 employee_colors[name] = colors[idx % len(colors)]
             
-            # Create x-positions for ALL calendar dates (no gaps between weeks)
-            x_positions = []
-            x_labels = []
-            x_dates_map = {}  # map date object to x position
-            current_x = 0
-            week_boundaries = []
-            
-            for week_idx, week_dates in enumerate(week_groups):
-                if week_idx > 0:
-                    # Mark boundary but don't add gap
-                    week_boundaries.append(current_x - 0.5)
-                
-                for dt in week_dates:
-                    x_dates_map[dt] = current_x
-                    x_positions.append(current_x)
-                    x_labels.append(dt.strftime('%d-%b-%y'))
-                    current_x += 1
-            
             # Plot baseline (very light gray)
             ax.axhline(BASELINE, color='#f0f0f0', linewidth=1.0, zorder=0)
             
-            # Plot each employee's data - separate lines per week
-            for name, series in sorted(data_by_emp.items()):
+            # Plot each employee's data - one segment per week so lines never cross
+            # a week boundary (NaN inside a segment leaves a gap). Everything goes
+            # into a single LineCollection + scatter instead of one Line2D per week
+            segments = []
+            seg_colors = []
+            for name, ys in data_by_emp:
                 emp_color = employee_colors[name]
-                # Plot each week separately to avoid connecting across gaps
-                for week_dates in week_groups:
-                    week_x = []
-                    week_y = []
-                    for dt in week_dates:
-                        date_str = dt.strftime('%Y-%m-%d')
-                        val = series.get(date_str, None)
-                        if val is not None:
-                            week_x.append(x_dates_map[dt])
-                            week_y.append(val)
-                        else:
-                            # Include None/NaN for missing data to create gaps in lines
-                            week_x.append(x_dates_map[dt])
-                            week_y.append(np.nan)
-                    
-                    # Plot this week's data (NaN will create gaps) with assigned color
-                    if len(week_x) > 0:
-                        line, = ax.plot(week_x, week_y, marker='o', markersize=3.5, 
-                                       linewidth=1.0, alpha=0.9, zorder=5, color=emp_color)
-                        # Only store handle once per employee
-                        if name not in handles:
-                            handles[name] = line
+                for xw, yw in zip(xs_by_week, np.split(ys, week_split_idx)):
+                    segments.append(np.column_stack([xw, yw]))
+                    seg_colors.append(emp_color)
+                handles[name] = mlines.Line2D([], [], color=emp_color, marker='o', markersize=3.5,
+                                              linewidth=1.0, alpha=0.9)
+            if data_by_emp:
+                ax.add_collection(LineCollection(segments, colors=seg_colors, linewidths=1.0,
+                                                 alpha=0.9, zorder=5))
+                all_y = np.concatenate([ys for _, ys in data_by_emp])
+                all_x = np.tile(x_positions, len(data_by_emp))
+                all_c = np.repeat([employee_colors[n] for n, _ in data_by_emp], len(x_positions), axis=0)
+                ax.scatter(all_x, all_y, c=all_c, s=3.5 ** 2, alpha=0.9, zorder=5)
             
             # Draw vertical separators between weeks (subtle)
             for boundary_x in week_boundaries:
@@ -468,8 +504,9 @@ def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
             
             # Set x-axis with proper limits
             ax.set_xlim(-0.8, max(x_positions) + 0.8)
-            ax.set_xticks(x_positions)
-            ax.set_xticklabels(x_labels, rotation=45, ha='right', fontsize=8)
+            ax.set_xticks(week_ticks)
+            ax.set_xticklabels(week_labels, rotation=0, fontsize=9)
+            ax.xaxis.set_minor_locator(FixedLocator(x_positions))
             
             # Style spines
             ax.spines['top'].set_visible(False)
@@ -484,10 +521,9 @@ def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
             ax.set_title(title, fontweight='bold', fontsize=13, pad=15)
             
             # Adjust layout to give more space for legend below
-            plt.subplots_adjust(top=0.92, bottom=0.38, left=0.06, right=0.98)
+            fig.subplots_adjust(top=0.92, bottom=0.28, left=0.06, right=0.98)
             
             # Build legend with proper spacing
-            import matplotlib.lines as mlines
             combined_handles = []
             combined_labels = []
             
@@ -512,41 +548,40 @@ def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
                           columnspacing=1.5,
                           handletextpad=0.5)
             
-            # Save with high DPI for quality
+            # JPEG at email resolution: Outlook scales the image to the message
+            # width anyway, and this encodes far faster than a 200 dpi PNG
             buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight', dpi=200, facecolor='white')
-            plt.close(fig)
+            fig.savefig(buf, format='jpg', bbox_inches='tight', dpi=120, facecolor='white',
+                        pil_kwargs={'quality': 85})
             buf.seek(0)
             return buf.read()
 
         # Compute y-limits
-        all_wrist_vals = [v for s in wrist_by_emp.values() for v in s.values()]
-        all_shoe_vals = [v for s in shoe_by_emp.values() for v in s.values()]
-        
         def compute_ylim(vals, ucl):
-            try:
-                if vals:
-                    ymax = max(max(vals), ucl) * 1.1
-                    return (0, ymax)
-            except Exception:
-                pass
+            # np.fmax skips NaN (no reading), so this is a single C-level pass
+            vmax = float(np.fmax.reduce(vals, axis=None, initial=-np.inf))
+            if np.isfinite(vmax):
+                return (0, max(vmax, ucl) * 1.1)
             return (0, ucl * 1.2)
 
-        wrist_img = make_row_image(wrist_by_emp, 'ESD WRIST STRAP MONITORING', 5, compute_ylim(all_wrist_vals, 5))
-        shoe_img = make_row_image(shoe_by_emp, 'ESD FOOTWEAR MONITORING', 10, compute_ylim(all_shoe_vals, 10))
+        # Agg rendering and JPEG encoding release the GIL, so draw both charts at once
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            wrist_future = ex.submit(make_row_image, wrist_vals, 'ESD WRIST STRAP MONITORING', 5, compute_ylim(wrist_vals, 5))
+            shoe_future = ex.submit(make_row_image, shoe_vals, 'ESD FOOTWEAR MONITORING', 10, compute_ylim(shoe_vals, 10))
+            wrist_img, shoe_img = wrist_future.result(), shoe_future.result()
         
         # Debug save
         try:
             if globals().get('DEBUG_SAVE_PNG'):
                 base = globals().get('DEBUG_SAVE_PATH', r"C:\Temp\esd_chart_debug.png")
                 try:
-                    with open(base.replace('.png', '_wrist.png'), 'wb') as f:
+                    with open(base.replace('.png', '_wrist.jpg'), 'wb') as f:
                         if wrist_img:
                             f.write(wrist_img)
                 except Exception:
                     pass
                 try:
-                    with open(base.replace('.png', '_shoe.png'), 'wb') as f:
+                    with open(base.replace('.png', '_shoe.jpg'), 'wb') as f:
                         if shoe_img:
                             f.write(shoe_img)
                 except Exception:
@@ -559,14 +594,18 @@ def _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp):
         return None, None
 
 
-def _attach_inline_image(mail, img_bytes, cid_name):
-    """Attach PNG bytes to mail and set attachment MAPI properties so it can be displayed inline via cid:cid_name."""
+def _attach_inline_image(mail, img_bytes, cid_name, mime='image/png'):
+    """Attach image bytes to mail and set attachment MAPI properties so it can be displayed inline via cid:cid_name."""
     try:
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        tmp.write(img_bytes)
-        tmp.close()
+        suffix = '.jpg' if mime == 'image/jpeg' else '.png'
+        # One unbuffered write straight to the descriptor; the caller unlinks the file
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            os.write(fd, img_bytes)
+        finally:
+            os.close(fd)
         # Attach by value and give a filename
-        attachment = mail.Attachments.Add(tmp.name, 1, 0, os.path.basename(tmp.name))
+        attachment = mail.Attachments.Add(tmp_path, 1, 0, os.path.basename(tmp_path))
         pa = attachment.PropertyAccessor
         try:
             # PR_ATTACH_CONTENT_ID
@@ -574,53 +613,76 @@ def _attach_inline_image(mail, img_bytes, cid_name):
             # PR_ATTACH_CONTENT_LOCATION - sometimes helpful for inline images
             pa.SetProperty("http://schemas.microsoft.com/mapi/proptag/0x3713001F", f"cid:{cid_name}")
             # PR_ATTACH_MIME_TAG
-            pa.SetProperty("http://schemas.microsoft.com/mapi/proptag/0x370E001F", "image/png")
+            pa.SetProperty("http://schemas.microsoft.com/mapi/proptag/0x370E001F", mime)
         except Exception:
             send_error_email(traceback.format_exc(), "Setting attachment properties")
-        # Save the mail item so Outlook persists the properties
-        try:
-            mail.Save()
-        except Exception:
-            pass
-        return tmp.name
-        return tmp.name
+        # No mail.Save() here: the properties are committed by mail.Send()
+        return tmp_path
     except Exception:
         send_error_email(traceback.format_exc(), "Attaching inline image")
         return None
 
 
-def send_absentee_email(absentees):
-    outlook = win32com.client.Dispatch("Outlook.Application")
-    mail = outlook.CreateItem(0)
-    display_date = datetime.datetime.now().strftime("%B %d, %Y")
+# Rendered chart images keyed by date, so a rerun on the same day reuses them
+_esd_chart_cache = {}
 
-    # Build the text part of the email
-    body_text = f"""
-    <p>The following personnel <b>did not enter the Production Area / perform ESD Wrist and Shoe Testing</b> on {display_date}:</p>
-    <ul>
-    {''.join(f'<li>{name}</li>' for name in absentees)}
-    </ul>
+
+def _get_esd_chart_images(day, esd=None):
+    """Returns (wrist_img, shoe_img, skipped) for the 31 days up to `day`, or None.
+    `esd` is an already fetched _get_esd_data() result. Only successful renders are cached.
     """
+    cached = _esd_chart_cache.get(day)
+    if cached is not None:
+        return cached
+    if esd is None:
+        esd = _get_esd_data(days=31)
+    if not esd:
+        return None
+    dates, names, wrist_vals, shoe_vals, skipped, _ = esd
+    wrist_img, shoe_img = _create_esd_plot_images(dates, names, wrist_vals, shoe_vals)
+    if wrist_img is None and shoe_img is None:
+        return None
+    _esd_chart_cache.clear()
+    _esd_chart_cache[day] = (wrist_img, shoe_img, skipped)
+    return _esd_chart_cache[day]
 
-    # Try to fetch data and create charts (wrist and shoe separate)
+
+def _attach_esd_charts(mail, wrist_heading):
+    """Attaches the ESD charts inline to `mail`. Returns (chart_html, tmp_files)."""
     chart_html = ""
     tmp_files = []
-    esd = _get_esd_data(days=31)
-    if esd:
-        dates, wrist_by_emp, shoe_by_emp, skipped = esd
-        wrist_img, shoe_img = _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp)
+    charts = _get_esd_chart_images(datetime.date.today())
+    if charts:
+        wrist_img, shoe_img, skipped = charts
         if wrist_img:
-            tmp = _attach_inline_image(mail, wrist_img, 'esd_wrist')
+            tmp = _attach_inline_image(mail, wrist_img, 'esd_wrist', 'image/jpeg')
             if tmp:
                 tmp_files.append(tmp)
-                chart_html += '<p><b>ESD Wrist Strap Monitoring (last 31 days):</b></p>\n<img src="cid:esd_wrist" style="max-width:100%;height:auto;" />'
+                chart_html += f'<p><b>{wrist_heading} (last 31 days):</b></p>\n<img src="cid:esd_wrist" style="max-width:100%;height:auto;" />'
         if shoe_img:
-            tmp2 = _attach_inline_image(mail, shoe_img, 'esd_shoe')
+            tmp2 = _attach_inline_image(mail, shoe_img, 'esd_shoe', 'image/jpeg')
             if tmp2:
                 tmp_files.append(tmp2)
                 chart_html += '<p><b>ESD Footwear Monitoring (last 31 days):</b></p>\n<img src="cid:esd_shoe" style="max-width:100%;height:auto;" />'
         if skipped:
             chart_html += f"\n<p style='font-size:smaller;color:#666;'><em>Note: {skipped} non-numeric readings were skipped when plotting.</em></p>"
+    return chart_html, tmp_files
+
+
+def send_absentee_email(absentees):
+    mail = _get_outlook().CreateItem(0)
+    display_date = datetime.datetime.now().strftime("%B %d, %Y")
+
+    # Build the text part of the email
+    body_text = f"""
+    <p>The following personnel <b>did not enter the Production Area / perform ESD Wrist and Shoe Testing</b> on {display_date}:</p>
+    <ul>
+    {''.join(f'<li>{name}</li>' for name in absentees)}
+    </ul>
+    """
+
+    # Try to fetch data and create charts (wrist and shoe separate)
+    chart_html, tmp_files = _attach_esd_charts(mail, 'ESD Wrist Strap Monitoring')
     html = f"""
     <html><body style="font-family:Tahoma;">{body_text}{chart_html}</body></html>
     """
@@ -644,30 +706,12 @@ def send_absentee_email(absentees):
 
 
 def send_no_absentee_email():
-    outlook = win32com.client.Dispatch("Outlook.Application")
-    mail = outlook.CreateItem(0)
+    mail = _get_outlook().CreateItem(0)
     display_date = datetime.datetime.now().strftime("%B %d, %Y")
 
     text = f"<p>All personnel entered the Production Area and performed ESD Wrist and Shoe Testing on {display_date}.</p>"
 
-    chart_html = ""
-    tmp_files = []
-    esd = _get_esd_data(days=31)
-    if esd:
-        dates, wrist_by_emp, shoe_by_emp, skipped = esd
-        wrist_img, shoe_img = _create_esd_plot_images(dates, wrist_by_emp, shoe_by_emp)
-        if wrist_img:
-            tmp = _attach_inline_image(mail, wrist_img, 'esd_wrist')
-            if tmp:
-                tmp_files.append(tmp)
-                chart_html += '<p><b>ESD Wrist Monitoring (last 31 days):</b></p>\n<img src="cid:esd_wrist" style="max-width:100%;height:auto;" />'
-        if shoe_img:
-            tmp2 = _attach_inline_image(mail, shoe_img, 'esd_shoe')
-            if tmp2:
-                tmp_files.append(tmp2)
-                chart_html += '<p><b>ESD Footwear Monitoring (last 31 days):</b></p>\n<img src="cid:esd_shoe" style="max-width:100%;height:auto;" />'
-        if skipped:
-            chart_html += f"\n<p style='font-size:smaller;color:#666;'><em>Note: {skipped} non-numeric readings were skipped when plotting.</em></p>"
+    chart_html, tmp_files = _attach_esd_charts(mail, 'ESD Wrist Monitoring')
     mail.Subject = f'Attendance Notice: All Present on {display_date}'
     mail.HTMLBody = f"<html><body style='font-family:Tahoma;'>{text}{chart_html}</body></html>"
     mail.To = '; '.join(recipient_emails)
@@ -692,10 +736,10 @@ def load_employee_names(json_path):
     try:
         with open(json_path, 'r') as f:
             data = json.load(f)
-        return list(data.values()) if isinstance(data, dict) else []
+        return set(data.values()) if isinstance(data, dict) else set()
     except Exception as e:
         send_error_email(e, "Loading employee names")
-        return []
+        return set()
 
 def check_attendance_and_send_alert():
     names_to_check = load_employee_names(EMPLOYEES_JSON_PATH)
@@ -703,24 +747,25 @@ def check_attendance_and_send_alert():
         return
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-
-        cursor.execute(
-            "SELECT DISTINCT emp_name FROM esd_data WHERE DATE(timestamp) = ?",
-            (today,)
-        )
+        # One 31-day query feeds both the attendance check and the charts
+        esd = _get_esd_data(days=31)
+        if esd:
+            present = esd[5]
+            _get_esd_chart_images(datetime.date.today(), esd)
+        else:
+            today = datetime.datetime.now().strftime("%Y-%m-%d")
+            cursor = _get_db().execute(
+                "SELECT DISTINCT emp_name FROM esd_data WHERE DATE(timestamp) = ?",
+                (today,)
+            )
+            present = {row[0] for row in cursor.fetchall()}
 
-        present = {row[0] for row in cursor.fetchall()}
-        absentees = [name for name in names_to_check if name not in present]
+        absentees = sorted(names_to_check - present)
 
         if absentees:
             send_absentee_email(absentees)
         else:
             send_no_absentee_email()
-
-        conn.close()
     except Exception as e:
         send_error_email(e, "Checking attendance DB")
 
@@ -737,3 +782,6 @@ if __name__ == "__main__":
             check_attendance_and_send_alert()
             break
         time.sleep(5)
+
+    # Don't exit while error emails are still queued on the daemon thread
+    wait_for_error_emails()
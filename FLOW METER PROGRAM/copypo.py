@@ -8,10 +8,12 @@ Updated: logs moved to a popup window; main UI sized for Raspberry Pi 7" display
 import os
 import sys
 import csv
+import mmap
 import time
 import math
 import random
 import threading
+import queue
 import struct
 import collections
 import datetime
@@ -20,28 +22,51 @@ import subprocess
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import customtkinter as ctk
-import matplotlib
-matplotlib.use("TkAgg")
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 
 # Try to import serial library (pyserial)
 try:
     import serial
     import serial.tools.list_ports
     SERIAL_AVAILABLE = True
+    # MF5708 line settings: 8N1
+    _SERIAL_FRAMING = dict(bytesize=serial.EIGHTBITS, parity=serial.PARITY_NONE,
+                           stopbits=serial.STOPBITS_ONE)
 except ImportError:
     SERIAL_AVAILABLE = False
     print("Warning: pyserial not installed. Run: pip install pyserial")
 
+# Optional: fastcrc (table-driven C) for the Modbus CRC, preferred over numba
+try:
+    from fastcrc import crc16 as fastcrc16
+    FASTCRC_AVAILABLE = True
+except ImportError:
+    FASTCRC_AVAILABLE = False
+
+# Optional: crcmod (C extension) as the next choice for the Modbus CRC
+try:
+    import crcmod.predefined
+    CRCMOD_AVAILABLE = True
+except ImportError:
+    CRCMOD_AVAILABLE = False
+
+# Optional: numba JIT for the Modbus CRC (plain Python is used without it)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
 # ---------------- PLATFORM DETECTION ----------------
 IS_RASPBERRY_PI = platform.system() == "Linux" and os.path.exists("/proc/device-tree/model")
 IS_WINDOWS = platform.system() == "Windows"
 PLATFORM_NAME = "Raspberry Pi" if IS_RASPBERRY_PI else ("Windows" if IS_WINDOWS else platform.system())
 
 # ---------------- DEBUG MODE ----------------
-DEBUG_MODE = True  # Set to False to disable debug output
+DEBUG_MODE = False  # Set to True to print every Modbus frame and total decision
 
 # ---------------- CONFIG ----------------
 LOGS_DIR = "logs"
@@ -54,10 +79,15 @@ DEFAULT_SETTINGS = {
     "slave_address": 1,         # Modbus slave address (1-247)
     "update_interval_ms": 1000, # Sampling interval
     "graph_window_sec": 60,     # Live graph window (seconds)
+    "low_latency": True,        # 1 ms USB-serial latency timer (Linux FTDI/CH34x adapters)
 }
 
 MAX_BUFFER_POINTS = 3600       # Memory buffer for live (1 hour)
 RECENT_TABLE_SIZE = 200        # Number of recent rows in live table
+DAY_TABLE_SIZE = 3600          # Newest rows of a day log shown in the logs table
+LOG_FLUSH_SEC = 5              # Max seconds of log rows held in the write buffer
+GRAPH_IDLE_REDRAW_SEC = 5      # Redraw interval for the live graph while flow is unchanged
+SERIAL_GAP_SEC = 0.02          # Silence on the line that ends a short Modbus reply early
 # ----------------------------------------
 
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -94,30 +124,433 @@ def get_log_file_path(dt=None):
     return fp
 
 
-def append_log(flow, total):
-    fp = get_log_file_path()
+def _tail_lines(path, n):
+    """Last n data lines of a log CSV, read backwards from the end in 64 KiB blocks."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(1 << 16, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    # The first line is either the header or cut off mid-row
+    return data.decode("utf-8", errors="replace").splitlines()[1:][-n:]
+
+
+def _csv_rows(lines):
+    rows = []
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        # Ensure 3 columns
+        if len(row) >= 3:
+            rows.append((row[0], row[1], row[2]))
+        else:
+            rows.append(tuple(row + [""]*(3-len(row))))
+    return rows
+
+
+def read_log_rows(path, last):
+    """
+    Return the last `last` data rows of a log CSV as (timestamp, flow, total)
+    string tuples, without reading the whole file.
+    """
+    return _csv_rows(_tail_lines(path, last))
+
+
+# Row layout of a day log: "YYYY-MM-DD HH:MM:SS", flow, total
+_DAY_DTYPE = [("t", "datetime64[s]"), ("flow", "f8"), ("total", "f8")]
+
+
+@njit(cache=True)
+def _scan_number(buf, i, end):
+    # Decimal like "-12.345" from buf[i:end]; returns (ok, value, index of the stop byte)
+    neg = False
+    if i < end and buf[i] == 45:
+        neg = True
+        i += 1
+    # Integer mantissa and a single division keep the result as exact as float()
+    mantissa = 0
+    scale = 1.0
+    digits = 0
+    while i < end and 48 <= buf[i] <= 57:
+        mantissa = mantissa * 10 + (buf[i] - 48)
+        digits += 1
+        i += 1
+    if i < end and buf[i] == 46:
+        i += 1
+        while i < end and 48 <= buf[i] <= 57:
+            mantissa = mantissa * 10 + (buf[i] - 48)
+            scale *= 10.0
+            digits += 1
+            i += 1
+    value = mantissa / scale
+    if neg:
+        value = -value
+    return digits > 0, value, i
+
+
+@njit(cache=True)
+def _scan_day_rows(buf, ts, flow, total):
+    """Fill ts/flow/total from a day log's bytes; rows that don't parse are skipped."""
+    size = buf.shape[0]
+    i = 0
+    while i < size and buf[i] != 10:    # header line
+        i += 1
+    i += 1
+    n = 0
+    while i < size:
+        j = i
+        while j < size and buf[j] != 10:
+            j += 1
+        end = j
+        if end > i and buf[end - 1] == 13:
+            end -= 1
+        # "YYYY-MM-DD HH:MM:SS" is fixed width, then ",flow,total"
+        ok = end - i > 20 and buf[i + 19] == 44
+        for k in range(19):
+            c = buf[i + k] if ok else 48
+            if k in (4, 7):
+                ok = ok and c == 45
+            elif k == 10:
+                ok = ok and c == 32
+            elif k in (13, 16):
+                ok = ok and c == 58
+            else:
+                ok = ok and 48 <= c <= 57
+        if ok:
+            y = (buf[i] - 48) * 1000 + (buf[i + 1] - 48) * 100 + (buf[i + 2] - 48) * 10 + (buf[i + 3] - 48)
+            mo = (buf[i + 5] - 48) * 10 + (buf[i + 6] - 48)
+            d = (buf[i + 8] - 48) * 10 + (buf[i + 9] - 48)
+            sec = ((buf[i + 11] - 48) * 10 + (buf[i + 12] - 48)) * 3600 \
+                + ((buf[i + 14] - 48) * 10 + (buf[i + 15] - 48)) * 60 \
+                + (buf[i + 17] - 48) * 10 + (buf[i + 18] - 48)
+            ok_f, f, k = _scan_number(buf, i + 20, end)
+            ok_t = False
+            t = 0.0
+            if ok_f and k < end and buf[k] == 44:
+                ok_t, t, k = _scan_number(buf, k + 1, end)
+            if ok_t and k == end and 1 <= mo <= 12:
+                # Days since 1970-01-01 for the proleptic Gregorian date (y >= 0)
+                yy = y - 1 if mo <= 2 else y
+                era = yy // 400
+                yoe = yy - era * 400
+                doy = (153 * (mo - 3 if mo > 2 else mo + 9) + 2) // 5 + d - 1
+                doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+                ts[n] = (era * 146097 + doe - 719468) * 86400 + sec
+                flow[n] = f
+                total[n] = t
+                n += 1
+        i = j + 1
+    return n
+
+
+def _scan_day_file(path):
+    """numba path for _parse_day_file: parse the memory-mapped file without Python objects per cell."""
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, 2))
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = None
+        try:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            rows = int(np.count_nonzero(buf == 10)) + 1
+            ts = np.empty(rows, dtype=np.int64)
+            fv = np.empty((2, rows))
+            n = _scan_day_rows(buf, ts, fv[0], fv[1])
+        finally:
+            # The mapping can't close while a view of it is alive. If the scan
+            # raised, its traceback still holds views: leave the unmapping to the
+            # garbage collector rather than hide that error behind a BufferError
+            buf = None
+            try:
+                mm.close()
+            except BufferError:
+                pass
+    return ts[:n].copy(), fv[:, :n].T.copy()
+
+
+def _parse_day_file(path):
+    """Parse a day log into (epoch-second int64 timestamps, (N, 2) flow/total array)."""
+    if NUMBA_AVAILABLE:
+        try:
+            return _scan_day_file(path)
+        except Exception as e:
+            print(f"Day log scan failed, reading {path} with numpy: {e}", file=sys.stderr)
+    try:
+        rec = np.loadtxt(path, delimiter=",", skiprows=1, dtype=_DAY_DTYPE, ndmin=1)
+    except ValueError:
+        # Damaged rows somewhere in the file: keep every row that still parses
+        rows = []
+        with open(path, "r") as f:
+            rdr = csv.reader(f)
+            next(rdr, None)
+            for row in rdr:
+                try:
+                    t = datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
+                    rows.append((t, float(row[1]), float(row[2])))
+                except Exception:
+                    pass
+        rec = np.array(rows, dtype=_DAY_DTYPE)
+    return rec["t"].astype(np.int64), np.column_stack((rec["flow"], rec["total"]))
+
+
+def load_day_arrays(path, mtimes=None):
+    """
+    Return (timestamps, flow/total) for a day log. Past days no longer change, so
+    their parsed arrays are kept next to the CSV as <day>.csv.npz and reused while
+    newer than the CSV. Today's file is still growing and is always parsed.
+    `mtimes` may give (csv mtime, cache mtime or None) from a directory scan.
+    """
+    if os.path.basename(path) == datetime.date.today().strftime("%Y-%m-%d") + ".csv":
+        return _parse_day_file(path)
+    cache = path + ".npz"
+    try:
+        if mtimes is None:
+            mtimes = (os.path.getmtime(path), os.path.getmtime(cache))
+        if mtimes[1] is not None and mtimes[1] >= mtimes[0]:
+            with np.load(cache) as z:
+                return z["t"], z["fv"]
+    except (OSError, ValueError, KeyError):
+        pass
+    ts, fv = _parse_day_file(path)
+    try:
+        tmp = cache + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, t=ts, fv=fv)
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    return ts, fv
+
+
+def append_hour_summary(hour, avg_flow, max_total, samples):
+    """Append one hour's rollup to HOUR_SUM_DIR/<YYYY-MM>.csv (creates header if missing)."""
+    _append_hour_rows(hour.strftime("%Y-%m"), [(hour, avg_flow, max_total, samples)])
+
+
+def _append_hour_rows(month, rows):
+    """Append (hour, avg flow, max total, samples) rows to one month's rollup in a single open."""
+    fp = os.path.join(HOUR_SUM_DIR, month + ".csv")
+    new_file = not os.path.exists(fp)
     with open(fp, "a", newline="") as f:
         w = csv.writer(f)
-        w.writerow([datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    f"{flow:.2f}", f"{total:.3f}"])
+        if new_file:
+            w.writerow(["Hour", "Avg Flow (SLPM)", "Max Total (NCM)", "Samples"])
+        w.writerows([hour.strftime("%Y-%m-%d %H:%M:%S"), f"{avg_flow:.6f}", f"{max_total:.3f}", samples]
+                    for hour, avg_flow, max_total, samples in rows)
+
+
+# Row layout of an hourly rollup: hour start, avg flow, max total, samples
+_HOUR_DTYPE = [("t", "datetime64[s]"), ("avg", "f8"), ("max", "f8"), ("n", "i8")]
+
+
+def _read_hour_summary(month):
+    """Rows of a "YYYY-MM" hourly rollup file, or None if it is missing, unreadable or empty."""
+    fp = os.path.join(HOUR_SUM_DIR, month + ".csv")
+    try:
+        rec = np.loadtxt(fp, delimiter=",", skiprows=1, ndmin=1, dtype=_HOUR_DTYPE)
+    except OSError:
+        return None
+    except ValueError:
+        # A torn last row after a power cut, or a row edited by hand: keep every row that parses
+        rows = []
+        try:
+            with open(fp, "r", newline="") as f:
+                rdr = csv.reader(f)
+                next(rdr, None)
+                for row in rdr:
+                    try:
+                        rows.append((datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S"),
+                                     float(row[1]), float(row[2]), int(row[3])))
+                    except (ValueError, IndexError):
+                        pass
+        except OSError:
+            return None
+        rec = np.array(rows, dtype=_HOUR_DTYPE)
+    return rec if rec.size else None
+
+
+def count_log_rows(path):
+    """Number of data rows (lines after the header) in a log CSV, counted without parsing."""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # final line without a newline
+    return max(lines - 1, 0)
+
+
+def load_day_hours(day):
+    """
+    (hour start epoch seconds, mean flow, total samples) for one datetime.date from
+    the hourly rollup, the first two as hourly_mean returns them; None if the
+    rollup has no rows for it.
+    """
+    rec = _read_hour_summary(day.strftime("%Y-%m"))
+    if rec is None:
+        return None
+    t = rec["t"].astype(np.int64)
+    start = np.datetime64(day, "s").astype(np.int64)
+    sel = (t >= start) & (t < start + 86400)
+    if not sel.any():
+        return None
+    # Merge the split rows a mid-hour restart leaves, weighting by samples
+    hours, inv = np.unique(t[sel] // 3600, return_inverse=True)
+    n = rec["n"][sel]
+    sums = np.bincount(inv, weights=rec["avg"][sel] * n)
+    counts = np.bincount(inv, weights=n)
+    return hours * 3600, sums / counts, int(n.sum())
+
+
+def load_month_summary(month):
+    """
+    Per-day (avg flow, max total, samples, hours present) for a "YYYY-MM" month from
+    its hourly rollup, as {datetime.date: (avg, max, n, frozenset of epoch hour
+    numbers)}. Empty if there is no usable summary file.
+    """
+    rec = _read_hour_summary(month)
+    if rec is None:
+        return {}
+    rec = rec[np.argsort(rec["t"], kind="stable")]
+    days = rec["t"].astype("datetime64[D]")
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    # A restart mid-hour leaves two rows for that hour; weighting by samples keeps the mean exact
+    counts = np.add.reduceat(rec["n"], starts)
+    sums = np.add.reduceat(rec["avg"] * rec["n"], starts)
+    maxes = np.maximum.reduceat(rec["max"], starts)
+    hours = np.split(rec["t"].astype(np.int64) // 3600, starts[1:])
+    return {d: (sm / n, mx, n, frozenset(h.tolist())) for d, sm, n, mx, h in
+            zip(days[starts].tolist(), sums.tolist(), counts.tolist(), maxes.tolist(), hours) if n}
+
+
+def backfill_day_summary(ts, fv, logged=frozenset()):
+    """
+    Write hourly rollup rows for a day log parsed by load_day_arrays, for the hours
+    the rollup lacks (epoch hour numbers in `logged` are already there), and return
+    the day's (avg flow, max total). The values are returned even if the rollup
+    can't be written.
+    """
+    hours, inv = np.unique(ts // 3600, return_inverse=True)
+    counts = np.bincount(inv, minlength=len(hours))
+    sums = np.bincount(inv, weights=fv[:, 0], minlength=len(hours))
+    maxes = np.full(len(hours), -np.inf)
+    np.maximum.at(maxes, inv, fv[:, 1])
+    # Re-adding a logged hour would count its samples twice in the weighted means
+    rows = [((hour * 3600).astype("datetime64[s]").item(), sm / n, mx, n)
+            for hour, sm, mx, n in zip(hours, sums.tolist(), maxes.tolist(), counts.tolist())
+            if int(hour) not in logged]
+    try:
+        # One append for the whole day, so a failure can't leave it half in the rollup
+        if rows:
+            _append_hour_rows(rows[0][0].strftime("%Y-%m"), rows)
+    except OSError as e:
+        # Read-only share, full disk or a file locked by Excel: retried on the next visit
+        print(f"Hourly summary backfill error: {e}", file=sys.stderr)
+    return float(fv[:, 0].mean()), float(fv[:, 1].max())
+
+
+@njit(cache=True)
+def _hourly_sums(hour_idx, flow, n_hours):
+    sums = np.zeros(n_hours)
+    counts = np.zeros(n_hours, dtype=np.int64)
+    for i in range(hour_idx.shape[0]):
+        sums[hour_idx[i]] += flow[i]
+        counts[hour_idx[i]] += 1
+    return sums, counts
+
+
+def hourly_mean(ts, flow):
+    """Return (hour start epoch seconds, mean flow) for every hour that has samples."""
+    if not len(ts):
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    first = ts.min() // 3600
+    hour_idx = ts // 3600 - first
+    n_hours = int(hour_idx.max()) + 1
+    if NUMBA_AVAILABLE:
+        sums, counts = _hourly_sums(hour_idx, np.ascontiguousarray(flow, dtype=np.float64), n_hours)
+    else:
+        sums = np.bincount(hour_idx, weights=flow, minlength=n_hours)
+        counts = np.bincount(hour_idx, minlength=n_hours)
+    has = counts > 0
+    return (np.flatnonzero(has) + first) * 3600, sums[has] / counts[has]
 
 
 # ============== MF5708 MODBUS RTU COMMUNICATION ==============
+def _make_crc16_table():
+    """CRC-16/Modbus (reflected poly 0xA001) value for every byte."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _make_crc16_table()
+_CRC16_TABLE_NP = np.array(_CRC16_TABLE, dtype=np.uint16)
+
+
+@njit(cache=True)
+def _crc16_modbus(buf, table):
+    crc = 0xFFFF
+    for byte in buf:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+# Fastest CRC-16/Modbus available, chosen once: fastcrc, crcmod, numba, then pure Python.
+# Every variant takes any bytes-like object (the reply is a memoryview) and returns an int.
+if FASTCRC_AVAILABLE:
+    _crc_modbus = fastcrc16.modbus
+elif CRCMOD_AVAILABLE:
+    _crc_modbus = crcmod.predefined.mkPredefinedCrcFun("modbus")
+elif NUMBA_AVAILABLE:
+    def _crc_modbus(data):
+        return int(_crc16_modbus(np.frombuffer(data, dtype=np.uint8), _CRC16_TABLE_NP))
+else:
+    def _crc_modbus(data):
+        # Python ints index the tuple table much faster than NumPy scalars would
+        return _crc16_modbus(data, _CRC16_TABLE)
+
+# Precompiled packers for two 16-bit registers <-> one IEEE754 float
+# (bound methods, so a conversion is two C calls with no attribute lookups)
+_PACK_HH = struct.Struct('>HH').pack_into
+_UNPACK_F = struct.Struct('>f').unpack_from
+
+
 class MF5708Sensor:
     """
     MF5708 Flow Meter RS485 Modbus RTU Communication
     (unchanged)
     """
-    def __init__(self, port=None, baudrate=9600, slave_addr=1, timeout=1.0):
+    def __init__(self, port=None, baudrate=9600, slave_addr=1, timeout=1.0, low_latency=True):
         self.port = port
         self.baudrate = baudrate
         self.slave_addr = slave_addr
         self.timeout = timeout
+        self.low_latency = low_latency
         self.serial = None
         self.connected = False
         self.last_error = ""
         self.last_total = None   # track previous total for continuity-based selection
         self.last_total_time = None  # timestamp of when last_total was set
+        # Per (slave_addr, start_reg, num_regs): the request frame, the reply
+        # length, the register unpacker and a receive buffer sized to the
+        # reply, all built on first use
+        self._req_cache = {}
+        self._silent_interval = 0.00175  # Modbus inter-frame gap, set from the baud rate on connect
+        self._last_rx = 0.0              # time.monotonic() when the last reply finished
+        self._f_buf = bytearray(4)       # scratch word pair for the register -> float casts
+        self._rx_stale = True            # last exchange failed, so a late reply may be buffered
 
     def connect(self):
         if not SERIAL_AVAILABLE:
@@ -126,6 +559,10 @@ class MF5708Sensor:
         if not self.port:
             self.last_error = "No port specified"
             return False
+        # Modbus RTU needs 3.5 character times (11 bits each) of silence
+        # between frames; the spec fixes 1.75 ms above 19200 baud
+        self._silent_interval = max(3.5 * 11 / self.baudrate, 0.00175)
+        self._rx_stale = True
         try:
             if DEBUG_MODE:
                 print(f"\n[DEBUG] ===== CONNECTING =====")
@@ -136,11 +573,19 @@ class MF5708Sensor:
             self.serial = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=self.timeout
+                timeout=self.timeout,
+                # A frame that stops short returns after this gap rather than the full timeout
+                inter_byte_timeout=SERIAL_GAP_SEC,
+                **_SERIAL_FRAMING
             )
+            if self.low_latency:
+                # USB adapters otherwise hold replies for their ~16 ms latency timer;
+                # only pyserial's Linux backend supports this
+                try:
+                    self.serial.set_low_latency_mode(True)
+                except (IOError, AttributeError, NotImplementedError) as e:
+                    if DEBUG_MODE:
+                        print(f"[DEBUG] Low latency mode unavailable: {e}")
             self.connected = True
             self.last_error = ""
             if DEBUG_MODE:
@@ -167,15 +612,7 @@ class MF5708Sensor:
         self.connected = False
 
     def _calc_crc16(self, data):
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc >>= 1
-        return crc
+        return _crc_modbus(data)
 
     def _build_read_request(self, start_reg, num_regs):
         msg = bytes([
@@ -196,54 +633,64 @@ class MF5708Sensor:
                 print(f"[DEBUG] Not connected or no serial port")
             return None
         try:
-            self.serial.reset_input_buffer()
-            time.sleep(0.01)
-            request = self._build_read_request(start_reg, num_regs)
+            # Only a late reply to a failed request leaves bytes waiting; after a
+            # good exchange even the in_waiting query is skipped
+            if self._rx_stale and self.serial.in_waiting:
+                self.serial.reset_input_buffer()
+                time.sleep(0.002)
+            # read_all asks for the same block every tick; keying on the address
+            # means a changed slave address simply builds a new plan
+            key = (self.slave_addr, start_reg, num_regs)
+            plan = self._req_cache.get(key)
+            if plan is None:
+                expected_len = 3 + 2 * num_regs + 2
+                plan = self._req_cache[key] = (self._build_read_request(start_reg, num_regs),
+                                               expected_len,
+                                               struct.Struct(f'>{num_regs}H'),
+                                               memoryview(bytearray(expected_len)))
+            request, expected_len, regs_be, rx = plan
             if DEBUG_MODE:
-                print(f"[DEBUG] TX (hex): {' '.join(f'{b:02X}' for b in request)}")
+                print(f"[DEBUG] TX (hex): {request.hex(' ').upper()}")
+            # Wait out only what is left of the inter-frame gap since the last reply
+            wait = self._silent_interval - (time.monotonic() - self._last_rx)
+            if wait > 0:
+                time.sleep(wait)
+            self._rx_stale = True  # until this exchange is known good
             self.serial.write(request)
             self.serial.flush()
             
-            # Wait for response with retry logic
-            expected_len = 3 + 2 * num_regs + 2
-            response = bytearray()
-            max_attempts = 10
-            attempt = 0
-            
-            while len(response) < expected_len and attempt < max_attempts:
-                time.sleep(0.05)  # Small delay between reads
-                available = self.serial.in_waiting
-                if available > 0:
-                    chunk = self.serial.read(available)
-                    response.extend(chunk)
-                    if DEBUG_MODE and len(chunk) > 0:
-                        print(f"[DEBUG] Read {len(chunk)} bytes (total: {len(response)}/{expected_len})")
-                attempt += 1
-            
+            # readinto() blocks until the whole frame is in (or the port times out),
+            # so the reply is picked up as soon as it arrives. pyserial implements it
+            # as read() plus a copy, so a bytes object is still made per frame; the
+            # fixed buffer just gives the checks below one full-length view to work on
+            n = self.serial.readinto(rx)
+            response = rx if n == expected_len else rx[:n]
+            self._last_rx = time.monotonic()
+
             if DEBUG_MODE:
-                print(f"[DEBUG] Final received: {len(response)} bytes")
+                print(f"[DEBUG] RX (hex): {response.hex(' ').upper()} ({len(response)} bytes)")
                 
             if len(response) < expected_len:
-                self.last_error = f"Incomplete response: {len(response)}/{expected_len} bytes after {attempt} attempts"
+                self.last_error = f"Incomplete response: {len(response)}/{expected_len} bytes"
                 if DEBUG_MODE:
                     print(f"[DEBUG] {self.last_error}")
                 return None
                 
-            data = response[:-2]
-            recv_crc = response[-2] | (response[-1] << 8)
-            calc_crc = self._calc_crc16(data)
-            if recv_crc != calc_crc:
+            # Running the CRC over the frame including its own (little-endian) CRC
+            # leaves 0 when intact, so the check needs no slice or byte juggling
+            if self._calc_crc16(response):
                 self.last_error = "CRC mismatch"
                 if DEBUG_MODE:
+                    calc_crc = self._calc_crc16(response[:-2])
+                    recv_crc = response[-2] | (response[-1] << 8)
                     print(f"[DEBUG] CRC mismatch: expected {calc_crc:04X}, got {recv_crc:04X}")
                 return None
-            byte_count = response[2]
-            values = []
-            for i in range(num_regs):
-                hi = response[3 + i*2]
-                lo = response[4 + i*2]
-                values.append((hi << 8) | lo)
-            return values
+            if response[2] != 2 * num_regs:
+                self.last_error = f"Unexpected byte count {response[2]}"
+                return None
+            # Big-endian 16-bit registers start right after addr/func/byte-count
+            self._rx_stale = False
+            return regs_be.unpack_from(response, 3)
         except Exception as e:
             self.last_error = str(e)
             if DEBUG_MODE:
@@ -253,14 +700,14 @@ class MF5708Sensor:
     def _regs_to_float(self, regs):
         if len(regs) < 2:
             return 0.0
-        raw = struct.pack('>HH', regs[0], regs[1])
-        return struct.unpack('>f', raw)[0]
+        _PACK_HH(self._f_buf, 0, regs[0], regs[1])
+        return _UNPACK_F(self._f_buf)[0]
 
     def _regs_to_float_swapped(self, regs):
         if len(regs) < 2:
             return 0.0
-        raw = struct.pack('>HH', regs[1], regs[0])
-        return struct.unpack('>f', raw)[0]
+        _PACK_HH(self._f_buf, 0, regs[1], regs[0])
+        return _UNPACK_F(self._f_buf)[0]
 
     def read_all(self):
         """
@@ -385,12 +832,99 @@ class MF5708Sensor:
             return None
 
 
+# ============== LIVE SAMPLE BUFFER ==============
+class LiveBuffer:
+    """
+    Fixed-size ring of (time, flow, total) samples held in NumPy arrays.
+    Once full, each new sample overwrites the oldest one in place.
+    """
+    ONE_DAY = np.timedelta64(1, "D")
+
+    def __init__(self, size=MAX_BUFFER_POINTS):
+        self.size = size
+        self.times = np.empty(size, dtype="datetime64[us]")
+        self.days = np.empty(size, dtype=np.float64)
+        # Flow is shown to 2 decimals, so float32 is plenty and halves what the
+        # graph copies each frame; totals reach 1e6 m3 and keep float64
+        self.flows = np.empty(size, dtype=np.float32)
+        self.totals = np.empty(size, dtype=np.float64)
+        self.head = 0    # next slot to write
+        self.count = 0
+        # matplotlib's date epoch, read on the first append (after the graph panel
+        # has imported matplotlib), so `days` holds what mdates.date2num would return
+        self.epoch = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, flow, total):
+        i = self.head
+        t64 = np.datetime64(t, "us")
+        self.times[i] = t64
+        if self.epoch is None:
+            import matplotlib.dates as mdates
+            self.epoch = np.datetime64(mdates.get_epoch(), "us")
+        self.days[i] = (t64 - self.epoch) / self.ONE_DAY
+        self.flows[i] = flow
+        self.totals[i] = total
+        self.head = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def _ordered(self, arr, last=None):
+        # The newest `last` samples (all if None) end just before head; they only
+        # need stitching when that run wraps past the start of the ring
+        start = self.head - (self.count if last is None else min(last, self.count))
+        if start >= 0:
+            return arr[start:self.head]
+        return np.concatenate((arr[start:], arr[:self.head]))
+
+    def arrays(self):
+        """Return (times, flows, totals) oldest first."""
+        return self._ordered(self.times), self._ordered(self.flows), self._ordered(self.totals)
+
+    def last_day(self):
+        """Matplotlib date number of the newest sample."""
+        return self.days[self.head - 1]
+
+    def since(self, cutoff):
+        """
+        Return (days, flows) for samples at or after `cutoff`, a matplotlib date
+        number like the returned times, ready for the live plot.
+        """
+        if self.count < self.size:
+            start = np.searchsorted(self.days[:self.count], cutoff)
+            return self.days[start:self.count], self.flows[start:self.count]
+        # Wrapped: [head:] holds the older half and [:head] the newer one, each sorted.
+        # Search both halves in place and copy only the samples inside the window.
+        head = self.head
+        start = head + np.searchsorted(self.days[head:], cutoff)
+        if start < self.size:
+            return (np.concatenate((self.days[start:], self.days[:head])),
+                    np.concatenate((self.flows[start:], self.flows[:head])))
+        start = np.searchsorted(self.days[:head], cutoff)
+        return self.days[start:head], self.flows[start:head]
+
+    def rows(self, last=None):
+        """Return the newest `last` samples (all if None) as (datetime, flow, total) tuples."""
+        return list(zip(self._ordered(self.times, last).tolist(),
+                        self._ordered(self.flows, last).tolist(),
+                        self._ordered(self.totals, last).tolist()))
+
+
 # ============== LOGS WINDOW (popup) ==============
 class LogsWindow:
     """Popup Toplevel for browsing logs and viewing CSV contents."""
 
     def __init__(self, parent_dashboard):
         self.parent = parent_dashboard
+        # Row ids of the live table, oldest first, and the newest time shown
+        # (None while the table holds something else, e.g. a loaded day file)
+        self._live_ids = collections.deque()
+        self._live_last = None
+        # Timestamp string of the last row formatted, keyed by whole second
+        self._ts_sec = None
+        self._ts_str = ""
+        self._live_pending = False  # an after_idle table refresh is queued
 
         #  CREATE TOPLEVEL FIRST (CRITICAL)
         self.top = tk.Toplevel(self.parent.root)
@@ -416,6 +950,9 @@ class LogsWindow:
 
             # Register with parent ONLY after success
             self.parent.logs_win = self
+            # ...and unregister the moment the window goes, so the dashboard
+            # can skip asking Tk whether it still exists on every tick
+            self.top.bind("<Destroy>", self._on_destroy, add="+")
 
             # ---- RPI WINDOW MANAGER FIX ----
             self.top.update_idletasks()
@@ -436,6 +973,10 @@ class LogsWindow:
             self.parent.logs_win = None
             raise RuntimeError(str(e))
 
+    def _on_destroy(self, event):
+        # <Destroy> also arrives for every child widget; only the Toplevel counts
+        if event.widget is self.top and self.parent.logs_win is self:
+            self.parent.logs_win = None
 
     def _build_ui(self):
         self.top.grid_rowconfigure(3, weight=1)
@@ -468,18 +1009,7 @@ class LogsWindow:
         table_frame.grid_rowconfigure(0, weight=1)
         table_frame.grid_columnconfigure(0, weight=1)
 
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Treeview",
-                        background="#ffffff",
-                        foreground="black",
-                        fieldbackground="#ffffff",
-                        font=("Consolas", 0))
-        style.configure("Treeview.Heading",
-                        background="#f0f0f0",
-                        foreground="black",
-                        font=("Arial", 9, "bold"))
-    
+        # Treeview style is configured once by FlowDashboard._setup_ttk_style
         self.tree = ttk.Treeview(table_frame, columns=("Time", "Flow", "Total"),
                                  show="headings", height=18)
         for c, w in [("Time", 160), ("Flow", 100), ("Total", 110)]:
@@ -494,10 +1024,12 @@ class LogsWindow:
     def load_months(self):
         self.month_listbox.delete(0, tk.END)
         try:
-            months = sorted([d for d in os.listdir(LOGS_DIR)
-                           if os.path.isdir(os.path.join(LOGS_DIR, d)) and d != "hourly_summary"])
-            for m in months:
-                self.month_listbox.insert(tk.END, m)
+            # scandir's DirEntry knows the entry type without an extra stat per folder
+            with os.scandir(LOGS_DIR) as it:
+                months = sorted(e.name for e in it if e.is_dir() and e.name != "hourly_summary")
+            # One Tcl call for the whole list rather than one per folder
+            if months:
+                self.month_listbox.insert(tk.END, *months)
         except Exception:
             pass
 
@@ -509,9 +1041,10 @@ class LogsWindow:
         month = self.month_listbox.get(sel[0])
         folder = os.path.join(LOGS_DIR, month)
         try:
-            files = sorted([f for f in os.listdir(folder) if f.endswith(".csv")])
-            for f in files:
-                self.day_listbox.insert(tk.END, f)
+            with os.scandir(folder) as it:
+                files = sorted(e.name for e in it if e.is_file() and e.name.endswith(".csv"))
+            if files:
+                self.day_listbox.insert(tk.END, *files)
         except Exception:
             pass
 
@@ -537,21 +1070,24 @@ class LogsWindow:
         self.parent.mode = "day"
         self.parent.current_dayfile = path
 
+    def _fill_tree(self, rows):
+        """
+        Replace the table contents with rows and return the new item ids.
+        The tree is unmapped meanwhile so Tk lays it out once, not per insert.
+        """
+        self.tree.grid_remove()
+        try:
+            self.tree.delete(*self.tree.get_children())
+            return [self.tree.insert("", tk.END, values=row) for row in rows]
+        finally:
+            self.tree.grid()
+
     def _display_csv_in_table(self, path):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
+        self._live_ids.clear()
+        self._live_last = None
         try:
-            with open(path, "r") as f:
-                rdr = csv.reader(f)
-                next(rdr, None)
-                for row in rdr:
-                    if not row:
-                        continue
-                    # Ensure 3 columns
-                    if len(row) >= 3:
-                        self.tree.insert("", tk.END, values=(row[0], row[1], row[2]))
-                    else:
-                        self.tree.insert("", tk.END, values=row + [""]*(3-len(row)))
+            # A full day at 1 Hz is ~86k rows; only the newest are worth laying out
+            self._fill_tree(read_log_rows(path, last=DAY_TABLE_SIZE))
         except Exception as e:
             print(f"Error loading CSV to table: {e}", file=sys.stderr)
 
@@ -562,27 +1098,44 @@ class LogsWindow:
             return
         month = self.month_listbox.get(sel[0])
         folder = os.path.join(LOGS_DIR, month)
-        files = sorted([os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".csv")])
+        # One scan finds the day files and their .npz caches; only days read from
+        # the raw file below are stat'ed, and load_day_arrays reuses those mtimes
+        with os.scandir(folder) as it:
+            entries = {e.name: e for e in it if e.name.endswith((".csv", ".csv.npz")) and e.is_file()}
+        files = sorted(os.path.join(folder, n) for n in entries if n.endswith(".csv"))
         if not files:
             messagebox.showinfo("Info", "No CSV files for this month.")
             return
+        # Past days come from the hourly rollup when it accounts for every logged
+        # row. Days it lacks or only partly covers (logged before the rollup
+        # existed, an hour lost to a crash) and today's still-growing file are
+        # read from the raw CSV
+        summary = load_month_summary(month)
+        today = datetime.date.today()
         days, avg_flows, totals = [], [], []
         for filepath in files:
             try:
-                flows, tots = [], []
-                with open(filepath, "r") as fh:
-                    rdr = csv.reader(fh)
-                    next(rdr, None)
-                    for r in rdr:
-                        if not r:
-                            continue
-                        flows.append(float(r[1]))
-                        tots.append(float(r[2]))
-                if flows:
-                    day_str = os.path.basename(filepath).replace(".csv", "")
-                    days.append(datetime.datetime.strptime(day_str, "%Y-%m-%d"))
-                    avg_flows.append(sum(flows) / len(flows))
-                    totals.append(max(tots))
+                day_str = os.path.basename(filepath).replace(".csv", "")
+                day = datetime.datetime.strptime(day_str, "%Y-%m-%d")
+                rolled = summary.get(day.date()) if day.date() != today else None
+                if rolled is not None and rolled[2] == count_log_rows(filepath):
+                    avg_flow, total = rolled[:2]
+                else:
+                    name = os.path.basename(filepath)
+                    cache = entries.get(name + ".npz")
+                    ts, arr = load_day_arrays(filepath, (entries[name].stat().st_mtime,
+                                                         cache.stat().st_mtime if cache else None))
+                    if not arr.size:
+                        continue
+                    if day.date() != today:
+                        # Add the hours the rollup lacks so the raw file isn't needed again
+                        avg_flow, total = backfill_day_summary(
+                            ts, arr, rolled[3] if rolled is not None else frozenset())
+                    else:
+                        avg_flow, total = float(arr[:, 0].mean()), float(arr[:, 1].max())
+                days.append(day)
+                avg_flows.append(avg_flow)
+                totals.append(total)
             except Exception:
                 continue
         if not days:
@@ -602,16 +1155,47 @@ class LogsWindow:
         parent_ax.grid(alpha=0.2, color='#e6e6e6')
         for spine in parent_ax.spines.values():
             spine.set_color('#cccccc')
-        # Hide secondary axis (Total) for the monthly view to avoid scale conflicts
-        try:
-            if getattr(self.parent, 'ax2', None):
-                self.parent.ax2.set_visible(False)
-        except Exception:
-            pass
         parent_fig.autofmt_xdate()
         self.parent.canvas.draw_idle()
         self.parent.mode = "month"
     
+    def _live_values(self, t, f, tot):
+        """Row values for one live sample; strftime runs once per second."""
+        sec = t.replace(microsecond=0)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_str = sec.strftime("%Y-%m-%d %H:%M:%S")
+        return (self._ts_str, f"{f:.2f}", f"{tot:.3f}")
+
+    def request_live_update(self):
+        """Refresh the live table once Tk is idle; requests made before then share it."""
+        if self._live_pending:
+            return
+        self._live_pending = True
+        self.top.after_idle(self._run_live_update)
+
+    def _run_live_update(self):
+        self._live_pending = False
+        self.update_live_table(self.parent.live.rows(RECENT_TABLE_SIZE))
+
+    def append_live_row(self, t, f, tot):
+        """
+        Put one new live sample on top of the table and drop the oldest row.
+        Falls back to a queued refresh when the table is not yet showing live rows.
+        """
+        if self._live_pending or self._live_last is None:
+            self.request_live_update()
+            return
+        if t <= self._live_last:
+            return
+        try:
+            self._live_ids.append(self.tree.insert("", 0, values=self._live_values(t, f, tot)))
+            if len(self._live_ids) > RECENT_TABLE_SIZE:
+                self.tree.delete(self._live_ids.popleft())
+            self._live_last = t
+        except tk.TclError:
+            self.parent.logs_win = None
+
     def update_live_table(self, items):
         """
         Update the logs window table with recent live items (list of (datetime, flow, total)).
@@ -627,14 +1211,25 @@ class LogsWindow:
         try:
             # Only keep RECENT_TABLE_SIZE most recent
             tail = items[-RECENT_TABLE_SIZE:]
-            # Replace contents with most recent first
+            if not tail:
+                return
             try:
-                # Use a snapshot of children in case they change while iterating
-                children = list(self.tree.get_children())
-                for r in children:
-                    self.tree.delete(r)
-                for t, f, tot in reversed(tail):
-                    self.tree.insert("", tk.END, values=(t.strftime("%Y-%m-%d %H:%M:%S"), f"{f:.2f}", f"{tot:.3f}"))
+                if self._live_last is None:
+                    new = tail
+                else:
+                    new = [it for it in tail if it[0] > self._live_last]
+                if self._live_last is None or len(new) >= RECENT_TABLE_SIZE:
+                    # Full rebuild, most recent first
+                    ids = self._fill_tree([self._live_values(t, f, tot) for t, f, tot in reversed(tail)])
+                    self._live_ids = collections.deque(reversed(ids))
+                else:
+                    # Usually one new sample: add it on top and drop the oldest row
+                    for t, f, tot in new:
+                        self._live_ids.append(self.tree.insert(
+                            "", 0, values=self._live_values(t, f, tot)))
+                        if len(self._live_ids) > RECENT_TABLE_SIZE:
+                            self.tree.delete(self._live_ids.popleft())
+                self._live_last = tail[-1][0]
             except tk.TclError:
                 # Underlying widget was destroyed; clear parent ref to stop future updates
                 try:
@@ -663,18 +1258,34 @@ class FlowDashboard:
             self.root.geometry("1400x900")
             self.root.minsize(1200, 700)
 
-        # Live data buffers
-        self.log_buffer = []
-        self.last_log_flush = time.time()
-        self.latest_reading = (0.0, 0.0, 0.0)
-        self.sensor_lock = threading.Lock()
+        # Log rows collect in the file object's 64 KiB buffer and are flushed
+        # every LOG_FLUSH_SEC, so there is no separate row list to batch. The
+        # deadline is monotonic so a Pi setting its clock back over NTP can't
+        # hold rows in the buffer.
+        self._log_flush_due = time.monotonic() + LOG_FLUSH_SEC
+        # Today's CSV stays open between samples; rolled over at midnight
+        self._log_fh = None
+        self._log_fh_date = None
+        self._log_writer = None
+        self._log_error = None
+        # Running rollup of the current hour for the hourly summary file
+        self._hour_start = None
+        self._hour_end = None
+        self._hour_flow_sum = 0.0
+        self._hour_samples = 0
+        self._hour_max_total = 0.0
+        # Worker -> UI handoff; when full the oldest reading is dropped
+        self.sample_q = queue.Queue(maxsize=4)
+        # Set on connect and on shutdown; the worker waits on it while disconnected
+        self.sensor_wake = threading.Event()
         self.last_valid = (0.0, 0.0)
         self.last_sensor_time = time.time()
         
         # State
         self.running = True
         self.update_after_id = None
-        self.graph_after_id = None
+        self._slider_jobs = {}  # pending debounced slider updates by settings key
+        self._tick_counter = 0
         self.mode = "live"  # "live", "day", "month"
         self.current_month = None
         self.current_dayfile = None
@@ -685,15 +1296,29 @@ class FlowDashboard:
         self.settings["com_port"] = self._auto_detect_port()
 
         # Sensor/Simulator
-        self.sensor = MF5708Sensor()
+        self.sensor = MF5708Sensor(low_latency=self.settings["low_latency"])
         self.connection_status = "Disconnected"
 
-        # Live data buffers
-        self.times = collections.deque(maxlen=MAX_BUFFER_POINTS)
-        self.flows = collections.deque(maxlen=MAX_BUFFER_POINTS)
-        self.totals = collections.deque(maxlen=MAX_BUFFER_POINTS)
+        # Live data buffer
+        self.live = LiveBuffer(MAX_BUFFER_POINTS)
+        # Last values posted to the cards, so an unchanged reading skips the Tk set
+        self._last_flow_val = self._last_total_val = None
+        self._last_flow_fmt = self._last_total_fmt = None
+        # Live graph is only redrawn promptly when the flow reading changes
+        self._graph_dirty = True
+        self._graph_last_flow = None
+        self._graph_drawn_at = 0.0
+        # Blitting: axes background saved after each full draw, the right edge of
+        # the current x range (the axis moves in steps, see _do_graph_update) and
+        # whether a full draw_idle is queued but hasn't run yet
+        self._graph_bg = None
+        self._xlim_right = None
+        self._draw_pending = False
+        # Fill polygon vertices, regrown only when the visible window outgrows them
+        self._fill_verts = np.zeros((0, 2))
 
         # Build UI
+        self._setup_ttk_style()
         self._build_ui()
 
         threading.Thread(target=self._sensor_worker, daemon=True).start()
@@ -701,7 +1326,6 @@ class FlowDashboard:
 
         # Start loops
         self._schedule_update()
-        self._schedule_graph()
 
     def _auto_detect_port(self):
         ports = get_available_ports()
@@ -813,60 +1437,25 @@ class FlowDashboard:
         graph_panel.grid(row=1, column=0, sticky="nsew", padx=8, pady=(6, 8))
         graph_panel.grid_rowconfigure(0, weight=1)
         graph_panel.grid_columnconfigure(0, weight=1)
-        
-
-        self.fig, self.ax = plt.subplots(figsize=(10, 5))
-        self.fig.patch.set_facecolor('#0f1724')
-        self.ax.set_facecolor('#0f1724')
-        self.ax.tick_params(colors='white')
-        self.ax.xaxis.label.set_color('white')
-        self.ax.yaxis.label.set_color('white')
-        self.ax.title.set_color('white')
-        for spine in self.ax.spines.values():
-            spine.set_color('#333')
-
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
-        self.ax.set_title("Live Flow / Total / Temp", fontsize=12)
-        self.ax.set_ylabel("Value")
-        self.ax.grid(alpha=0.2, color='#444')# Matplotlib figure (use smaller size on Pi)
-        
-# Create a single, prominent flow plot (L/min)
-        if IS_RASPBERRY_PI:
-            figsize = (7, 3)
-            title_fontsize = 10
-        else:
-            figsize = (10, 5)
-            title_fontsize = 12
 
-        self.fig, self.ax = plt.subplots(figsize=figsize)
-        self.fig.patch.set_facecolor('#ffffff')
-        self.ax.set_facecolor('#ffffff')
+        # Create a single, prominent flow plot (L/min); smaller on the Pi
+        figsize = (7, 3) if IS_RASPBERRY_PI else (10, 5)
 
-        # Appearance for a "real" clear graph
-        self.ax.tick_params(colors='black', labelsize=10)
-        self.ax.xaxis.label.set_color('black')
-        self.ax.yaxis.label.set_color('black')
-        self.ax.title.set_color('black')
-        for spine in self.ax.spines.values():
-            spine.set_color('#cccccc')
+        # matplotlib is imported here rather than at module load since it is
+        # slow to import on the Pi and nothing before this panel needs it.
+        # The figure is embedded directly, so pyplot (and its figure registry)
+        # is never loaded.
+        import matplotlib.dates as mdates
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self._mdates = mdates
 
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
-        self.ax.set_title("Live Flow (L/min)", fontsize=title_fontsize, color='black')
-        self.ax.set_ylabel("Flow (L/min)", color='black')
-
-        # Thicker, high-visibility flow line + marker + filled area
-        self.flow_line, = self.ax.plot([], [], label="Flow (L/min)",
-                                       color="#007acc", linewidth=2.8, alpha=0.98, zorder=3)
-        self.flow_marker, = self.ax.plot([], [], 'o', color="#ff6b6b", markersize=8, zorder=6)
-        self.flow_fill = None  # will hold fill_between PolyCollection
-
-        # Stronger but unobtrusive grid
-        self.ax.grid(alpha=0.25, color='#e6e6e6', linestyle='-')
-
-        # Legend
-        self.ax.legend(loc="upper left", fontsize=9, framealpha=0.9)
+        # Styling, artists and legend are all set up by _setup_live_plot below
+        self.fig = Figure(figsize=figsize)
+        self.ax = self.fig.add_subplot()
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_panel)
+        self.canvas.mpl_connect("draw_event", self._on_graph_draw)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=4, pady=4)
         # Initialise live plot artists
         self._setup_live_plot()
@@ -882,6 +1471,20 @@ class FlowDashboard:
         ctk.CTkButton(ctrl, text=" Exit", fg_color="#dc3545", command=self._exit_now).grid(row=0, column=4, padx=6, pady=8)
 
     # ==================== SETTINGS CALLBACKS ====================
+    def _setup_ttk_style(self):
+        """Theme the ttk widgets (the logs table) once, rather than on every popup."""
+        style = ttk.Style(self.root)
+        style.theme_use("clam")
+        style.configure("Treeview",
+                        background="#ffffff",
+                        foreground="black",
+                        fieldbackground="#ffffff",
+                        font=("Consolas", 0))
+        style.configure("Treeview.Heading",
+                        background="#f0f0f0",
+                        foreground="black",
+                        font=("Arial", 9, "bold"))
+
     def _setup_live_plot(self):
         """(Re)initialise the live plot axes and Line2D/collections used by live updates."""
         if not getattr(self, "fig", None) or not getattr(self, "ax", None) or not getattr(self, "canvas", None):
@@ -899,26 +1502,35 @@ class FlowDashboard:
         for spine in self.ax.spines.values():
             spine.set_color('#cccccc')
 
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
+        # Date locator/units up front, since live updates pass plain float days
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(self._mdates.DateFormatter("%H:%M:%S"))
         self.ax.set_title("Live Flow (L/min)", fontsize=title_fontsize, color='black')
         self.ax.set_ylabel("Flow (L/min)", color='black')
 
-        # Create the prominent flow line and marker used by _do_graph_update
-        self.flow_line, = self.ax.plot([], [], label="Flow (L/min)",
+        # Create the prominent flow line, marker and soft fill used by _do_graph_update.
+        # They are animated: full draws leave them out and they are blitted on top
+        from matplotlib.collections import PolyCollection
+        self.flow_line, = self.ax.plot([], [], label="Flow (L/min)", animated=True,
                                        color="#007acc", linewidth=2.8, alpha=0.98, zorder=3)
-        self.flow_marker, = self.ax.plot([], [], 'o', color="#ff6b6b", markersize=8, zorder=6)
-        self.flow_fill = None
-
-        # Hide any secondary axis previously used (safe-guard)
-        try:
-            if getattr(self, "ax2", None):
-                self.ax2.set_visible(False)
-        except Exception:
-            pass
+        self.flow_marker, = self.ax.plot([], [], 'o', color="#ff6b6b", markersize=8, zorder=6,
+                                         animated=True)
+        self.flow_fill = PolyCollection([], facecolors="#cfeeff", edgecolors="#cfeeff",
+                                        alpha=0.4, zorder=2, animated=True)
+        self.ax.add_collection(self.flow_fill, autolim=False)
+        self._graph_dirty = True
+        self._graph_bg = None
+        self._xlim_right = None
+        self._draw_pending = False
 
         self.ax.grid(alpha=0.25, color='#e6e6e6', linestyle='-')
         self.ax.legend(loc="upper left", fontsize=9, framealpha=0.9)
 
+        # Fixed Y axis range: 0 to 20 L/min
+        self.ax.set_ylim(0.0, 20.0)
+        # Rotated time labels; ticks created later copy this label style
+        self.fig.autofmt_xdate()
+
         try:
             self.canvas.draw_idle()
         except Exception:
@@ -931,14 +1543,25 @@ class FlowDashboard:
             self.port_combo.set(ports[0])
 
     def _on_interval_change(self, value):
-        val = int(value)
-        self.settings["update_interval_ms"] = val
-        self.interval_label.configure(text=f"{val} ms")
+        self._debounce_setting("update_interval_ms", int(value), self.interval_label, "ms")
 
     def _on_window_change(self, value):
-        val = int(value)
-        self.settings["graph_window_sec"] = val
-        self.window_label.configure(text=f"{val} sec")
+        self._debounce_setting("graph_window_sec", int(value), self.window_label, "sec")
+
+    def _debounce_setting(self, key, val, label, unit):
+        # Sliders call back on every step of a drag; apply only where it stops
+        job = self._slider_jobs.pop(key, None)
+        if job:
+            self.root.after_cancel(job)
+        self._slider_jobs[key] = self.root.after(50, self._apply_setting, key, val, label, unit)
+
+    def _apply_setting(self, key, val, label, unit):
+        self._slider_jobs.pop(key, None)
+        self.settings[key] = val
+        label.configure(text=f"{val} {unit}")
+        if key == "graph_window_sec":
+            # Lay the live x axis out again for the new window
+            self._xlim_right = None
 
     def _toggle_connection(self):
         if self.sensor.connected:
@@ -964,6 +1587,7 @@ class FlowDashboard:
                 self.connect_btn.configure(text="Disconnect", fg_color="#dc3545")
                 self.status_label.configure(text=f"Ï Connected: {port}", text_color="#00ff88")
                 self.error_label.configure(text="")
+                self.sensor_wake.set()
             else:
                 self.error_label.configure(text=f"Error: {self.sensor.last_error}")
 
@@ -973,11 +1597,18 @@ class FlowDashboard:
         if not self.sensor.connected:
             return self.last_valid
 
-        if not self.latest_reading:
+        # Only the worker thread talks to the port; take its newest result
+        reading = None
+        while True:
+            try:
+                reading = self.sample_q.get_nowait()
+            except queue.Empty:
+                break
+        if not reading:
             # No new reading yet — return last valid
             return self.last_valid
 
-        flow, total, _ = self.latest_reading
+        flow, total, _ = reading
         try:
             f = round(float(flow), 3)
         except Exception:
@@ -993,56 +1624,92 @@ class FlowDashboard:
 
     def _sensor_worker(self):
         MIN_POLL = 0.5  # seconds
+        shown_error = ""
 
         while self.running:
             if not self.sensor.connected:
-                time.sleep(0.2)
+                # Disconnecting clears the error label, so the next error is news again
+                shown_error = ""
+                # Sleep until there is a port to read, instead of checking every 0.2 s
+                self.sensor_wake.wait()
+                self.sensor_wake.clear()
                 continue
 
-            start = time.time()
+            start = time.monotonic()
             result = self.sensor.read_all()
 
             if result is not None:
-                self.latest_reading = result
-
                 self.last_sensor_time = time.time()
+                try:
+                    self.sample_q.put_nowait(result)
+                except queue.Full:
+                    try:
+                        self.sample_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    try:
+                        self.sample_q.put_nowait(result)
+                    except queue.Full:
+                        pass
 
-            elapsed = time.time() - start
-            sleep_time = max(0.0, MIN_POLL - elapsed)
-            time.sleep(sleep_time)
+            # Report read failures on the Tk thread, only when the message changes;
+            # a good read clears the label and resets that
+            error = "" if result is not None else self.sensor.last_error
+            if error != shown_error:
+                shown_error = error
+                try:
+                    self.root.after(0, self._show_read_error, error)
+                except Exception:
+                    pass
 
-    # ==================== UPDATE LOOPS ====================
-    def _schedule_update(self):
-            if not self.running:
-                return
+            # Pace polls on the same event so shutdown or a reconnect cuts the wait short
+            if self.sensor_wake.wait(max(0.0, MIN_POLL - (time.monotonic() - start))):
+                self.sensor_wake.clear()
+                # A reconnect cleared the error label too
+                shown_error = ""
 
-            self._do_update()
-            self.update_after_id = self.root.after(self.settings["update_interval_ms"], self._schedule_update)
+    def _show_read_error(self, error):
+        if self.running and self.sensor.connected:
+            self.error_label.configure(text=f"Read error: {error}" if error else "")
 
-    def _schedule_graph(self):
+    # ==================== UPDATE LOOPS ====================
+    def _schedule_update(self):
         if not self.running:
             return
-        self._do_graph_update()
-        self.graph_after_id = self.root.after(1000, self._schedule_graph)
+
+        self._do_update()
+        # The graph shares this timer and redraws about once a second
+        interval = self.settings["update_interval_ms"]
+        self._tick_counter += 1
+        if self._tick_counter % max(1, 1000 // interval) == 0:
+            self._do_graph_update()
+        self.update_after_id = self.root.after(interval, self._schedule_update)
 
     def _do_update(self):
         flow, total = self._read_sensor()
         now = datetime.datetime.now()
-        self.times.append(now)
-        self.flows.append(flow)
-        self.totals.append(total)
+        self.live.append(now, flow, total)
+        if flow != self._graph_last_flow:
+            self._graph_last_flow = flow
+            self._graph_dirty = True
         if self.mode == "live":
-            self.var_flow.set(f"{flow:.2f}")
-            self.var_total.set(f"{total:.3f}")
-            try:
-                append_log(flow, total)
-            except Exception:
-                pass
-            # Update logs popup table if open and still exists
-            if self.logs_win and getattr(self.logs_win, 'top', None) and self.logs_win.top.winfo_exists() and getattr(self.logs_win, 'tree', None):
-                items = list(zip(self.times, self.flows, self.totals))
+            if flow != self._last_flow_val:
+                self._last_flow_val = flow
+                s = f"{flow:.2f}"
+                if s != self._last_flow_fmt:
+                    self._last_flow_fmt = s
+                    self.var_flow.set(s)
+            if total != self._last_total_val:
+                self._last_total_val = total
+                s = f"{total:.3f}"
+                if s != self._last_total_fmt:
+                    self._last_total_fmt = s
+                    self.var_total.set(s)
+            self._append_log(now, flow, total)
+            # Update logs popup table if open (it clears logs_win when destroyed)
+            if self.logs_win:
                 try:
-                    self.logs_win.update_live_table(items)
+                    self.logs_win.append_live_row(now, flow, total)
                 except Exception:
                     # If anything goes wrong, clear the reference to avoid repeated errors
                     try:
@@ -1050,48 +1717,100 @@ class FlowDashboard:
                     except Exception:
                         pass
 
+    def _append_log(self, now, flow, total):
+        # A new hour (or a clock set back) is the only time the hourly rollup or
+        # the day file can change; otherwise this is two datetime comparisons
+        if self._hour_start is None or not (self._hour_start <= now < self._hour_end):
+            self._flush_hour_summary()
+            self._hour_start = now.replace(minute=0, second=0, microsecond=0)
+            self._hour_end = self._hour_start + datetime.timedelta(hours=1)
+            if self._log_fh_date != now.date():
+                self._close_log()
+        try:
+            if self._log_fh is None:
+                self._log_fh = open(get_log_file_path(now), "a", newline="", buffering=1 << 16)
+                self._log_writer = csv.writer(self._log_fh)
+                self._log_fh_date = now.date()
+            self._log_writer.writerow([now.strftime("%Y-%m-%d %H:%M:%S"),
+                                       f"{flow:.2f}", f"{total:.3f}"])
+            t = time.monotonic()
+            if t >= self._log_flush_due:
+                self._log_fh.flush()
+                self._log_flush_due = t + LOG_FLUSH_SEC
+            self._log_error = None
+        except OSError as e:
+            # Reopen on the next sample; report each distinct failure once
+            self._close_log()
+            if str(e) != self._log_error:
+                self._log_error = str(e)
+                print(f"Log write error: {e}", file=sys.stderr)
+
+        self._hour_flow_sum += flow
+        self._hour_samples += 1
+        self._hour_max_total = max(self._hour_max_total, total) if self._hour_samples > 1 else total
+
+    def _flush_hour_summary(self):
+        if self._hour_samples:
+            try:
+                append_hour_summary(self._hour_start, self._hour_flow_sum / self._hour_samples,
+                                    self._hour_max_total, self._hour_samples)
+            except Exception as e:
+                print(f"Hourly summary error: {e}", file=sys.stderr)
+        self._hour_start = None
+        self._hour_end = None
+        self._hour_flow_sum = 0.0
+        self._hour_samples = 0
+        self._hour_max_total = 0.0
+
+    def _close_log(self):
+        if self._log_fh:
+            try:
+                self._log_fh.close()
+            except Exception:
+                pass
+        self._log_fh = None
+        self._log_fh_date = None
+        self._log_writer = None
+
     def _do_graph_update(self):
         if self.mode != "live":
             return
+        # A flat reading (or a disconnected sensor) only needs the axis to
+        # scroll now and then, not a full redraw every tick
+        if not self._graph_dirty and time.monotonic() - self._graph_drawn_at < GRAPH_IDLE_REDRAW_SEC:
+            return
         try:
-            if not self.times:
+            if not self.live:
                 return
 
-            # local font size consistent with build
-            title_fontsize = 10 if IS_RASPBERRY_PI else 12
-
+            # The newest sample was appended this tick, so its date number stands in
+            # for "now" without another clock read or datetime conversion
             window_seconds = self.settings["graph_window_sec"]
-            now = datetime.datetime.now()
-            cutoff = now - datetime.timedelta(seconds=window_seconds)
+            now_num = self.live.last_day()
 
-            xs, ys_flow = [], []
-            for t, f in zip(self.times, self.flows):
-                if t >= cutoff:
-                    xs.append(t)
-                    ys_flow.append(f)
+            # Samples are time-ordered, so the window is a binary search away
+            xs, ys_flow = self.live.since(now_num - window_seconds / 86400.0)
 
-            if not xs:
+            if not len(xs):
                 return
 
+            # xs are already matplotlib date floats (LiveBuffer.days), so the line,
+            # fill, marker and limits below skip any unit conversion
+
             # Update line data
             self.flow_line.set_data(xs, ys_flow)
 
-            # Update fill under curve: remove old and add new
-            try:
-                if self.flow_fill is not None:
-                    # remove previous collection(s)
-                    try:
-                        self.flow_fill.remove()
-                    except Exception:
-                        pass
-                    self.flow_fill = None
-            except Exception:
-                pass
-            try:
-                # create a soft fill under the flow line
-                self.flow_fill = self.ax.fill_between(xs, ys_flow, color="#cfeeff", alpha=0.4, zorder=2)
-            except Exception:
-                self.flow_fill = None
+            # Reshape the fill polygon in place: down to the baseline at each end.
+            # The vertex array is reused, so a steady window allocates nothing here
+            n = len(xs) + 2
+            if len(self._fill_verts) < n:
+                self._fill_verts = np.empty((max(n, 2 * len(self._fill_verts)), 2))
+            verts = self._fill_verts[:n]
+            verts[1:-1, 0] = xs
+            verts[1:-1, 1] = ys_flow
+            verts[0] = xs[0], 0.0
+            verts[-1] = xs[-1], 0.0
+            self.flow_fill.set_verts([verts])
 
             # Marker for latest value
             try:
@@ -1099,25 +1818,46 @@ class FlowDashboard:
             except Exception:
                 pass
 
-            # X axis limits
-            self.ax.set_xlim(cutoff, now)
-
-            # Y axis scaling with padding (avoid zero-range)
-# Fixed Y axis range: 0 to 20 L/min
-            self.ax.set_ylim(0.0, 20.0)
-
-            # Styling / redraw
-            self.ax.set_title("Live Flow (L/min)", color='black', fontsize=title_fontsize)
-            self.ax.tick_params(colors='black')
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
-            self.ax.grid(alpha=0.25, color='#e6e6e6')
-            for spine in self.ax.spines.values():
-                spine.set_color('#cccccc')
-            self.fig.autofmt_xdate()
-            self.canvas.draw_idle()
+            # The x range jumps ahead a tenth of the window at a time. Only then do
+            # the ticks and grid change and need a full draw (which also saves the
+            # new background); in between, the animated artists are blitted over it.
+            # Y range and all styling are set once in _setup_live_plot.
+            if self._draw_pending:
+                # A full draw is already queued and will paint the artists as set above
+                pass
+            elif self._graph_bg is None or self._xlim_right is None or now_num > self._xlim_right:
+                self._graph_bg = None
+                self._xlim_right = now_num + window_seconds / 10 / 86400.0
+                self.ax.set_xlim(self._xlim_right - window_seconds / 86400.0, self._xlim_right)
+                self._draw_pending = True
+                self.canvas.draw_idle()
+            else:
+                self.canvas.restore_region(self._graph_bg)
+                self._draw_live_artists()
+                self.canvas.blit(self.ax.bbox)
+            self._graph_dirty = False
+            self._graph_drawn_at = time.monotonic()
         except Exception as e:
             print(f"Graph update error: {e}", file=sys.stderr)
             
+    def _draw_live_artists(self):
+        for artist in (self.flow_fill, self.flow_line, self.flow_marker):
+            if artist is not None:
+                self.ax.draw_artist(artist)
+
+    def _on_graph_draw(self, event):
+        """After a full canvas draw, keep the background for blitting and paint the live artists."""
+        self._draw_pending = False
+        if self.mode != "live":
+            self._graph_bg = None
+            return
+        try:
+            self._graph_bg = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._draw_live_artists()
+        except Exception as e:
+            self._graph_bg = None
+            print(f"Graph draw error: {e}", file=sys.stderr)
+
     # ==================== LOGS POPUP ====================
     def _open_logs_window(self):
         # Window exists AND is valid
@@ -1144,60 +1884,57 @@ class FlowDashboard:
             
     def _switch_to_live(self):
         """Switch back to live view mode and refresh graph/table immediately."""
+        was_live = self.mode == "live"
         self.mode = "live"
         self.current_dayfile = None
 
-        # Recreate live plot artists (in case day/month cleared the axes)
-        try:
-            self._setup_live_plot()
-        except Exception:
-            pass
+        # Recreate live plot artists only if a day/month view cleared the axes;
+        # pressing Live View while already live keeps the styled plot as is
+        if not was_live:
+            try:
+                self._setup_live_plot()
+            except Exception:
+                pass
 
         # Force an immediate graph refresh
         try:
             self._do_graph_update()
         except Exception:
             pass
+
+        # Catch the logs table up on samples taken while a log was displayed
+        if self.logs_win:
+            try:
+                self.logs_win.request_live_update()
+            except Exception:
+                self.logs_win = None
     # ==================== LOGS HANDLING (when loaded from logs popup) ====================
     def _display_day_file(self, path, label):
         """Display day file data in main graph (called from LogsWindow)."""
         try:
-            times, flows = [], []
-            with open(path, "r") as f:
-                rdr = csv.reader(f)
-                next(rdr, None)
-                for row in rdr:
-                    if not row:
-                        continue
-                    try:
-                        t = datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
-                        times.append(t)
-                        flows.append(float(row[1]))
-                    except Exception:
-                        pass
-            hourly = {}
-            for t, v in zip(times, flows):
-                hour = t.replace(minute=0, second=0, microsecond=0)
-                hourly.setdefault(hour, []).append(v)
-            if hourly:
-                keys = sorted(hourly.keys())
-                avg = [sum(hourly[k]) / len(hourly[k]) for k in keys]
+            # The raw day file is the source of truth. A past day's rollup is used
+            # only when it accounts for every logged row; an hour lost to a crash
+            # or logged before the rollup existed sends the view to the raw file
+            day = datetime.datetime.strptime(os.path.basename(path)[:10], "%Y-%m-%d").date()
+            hourly = load_day_hours(day) if day != datetime.date.today() else None
+            if hourly is not None and hourly[2] == count_log_rows(path):
+                hours, means = hourly[:2]
+            else:
+                ts, fv = load_day_arrays(path)
+                hours, means = hourly_mean(ts, fv[:, 0])
+            if len(hours):
+                keys = hours.astype("datetime64[s]").tolist()
+                avg = means.tolist()
                 self.ax.clear()
                 # Use same styling as live (white background, black ticks)
                 self.ax.set_facecolor('#ffffff')
                 self.ax.plot(keys, avg, marker="o", linewidth=2, color="#00d4ff")
                 self.ax.set_title(f"{label}  Hourly Average", color='black')
-                self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+                self.ax.xaxis.set_major_formatter(self._mdates.DateFormatter("%H:%M"))
                 self.ax.tick_params(colors='black')
                 self.ax.grid(alpha=0.2, color='#e6e6e6')
                 for spine in self.ax.spines.values():
                     spine.set_color('#cccccc')
-                # Hide secondary axis (Total) when viewing day/hourly summary
-                try:
-                    if getattr(self, 'ax2', None):
-                        self.ax2.set_visible(False)
-                except Exception:
-                    pass
                 self.fig.autofmt_xdate()
                 self.canvas.draw_idle()
         except Exception as e:
@@ -1213,22 +1950,34 @@ class FlowDashboard:
             messagebox.showinfo("Saved", f"Graph saved to:\n{fn}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
+        finally:
+            # savefig's draw_event made _on_graph_draw save a 150 dpi background;
+            # redraw on screen so the next blit restores the right one
+            self._graph_bg = None
+            self._draw_pending = True
+            self.canvas.draw_idle()
 
     def _export_csv(self):
         fn = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         if not fn:
             return
         try:
-            with open(fn, "w", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(["Time", "Flow", "Total"])
-                # If logs popup is open, export its table; otherwise export recent buffer
-                if self.logs_win and getattr(self.logs_win, "tree", None):
-                    for item in self.logs_win.tree.get_children():
-                        w.writerow(self.logs_win.tree.item(item)["values"])
-                else:
-                    for t, fval, tot in zip(self.times, self.flows, self.totals):
-                        w.writerow([t.strftime("%Y-%m-%d %H:%M:%S"), f"{fval:.2f}", f"{tot:.3f}"])
+            # If logs popup is open, export its table; otherwise export recent buffer
+            if self.logs_win and getattr(self.logs_win, "tree", None):
+                tree = self.logs_win.tree
+                with open(fn, "w", newline="") as f:
+                    w = csv.writer(f)
+                    w.writerow(["Time", "Flow", "Total"])
+                    w.writerows([tree.item(item, "values") for item in tree.get_children()])
+            else:
+                times, flows, totals = self.live.arrays()
+                stamps = np.char.replace(np.datetime_as_string(times, unit="s"), "T", " ")
+                # Format every row in one pass and hand the file a single block
+                # (savetxt formats and writes row by row through an object array)
+                body = "".join(map("{},{:.2f},{:.3f}\n".format,
+                                   stamps.tolist(), flows.tolist(), totals.tolist()))
+                with open(fn, "w", newline="") as f:
+                    f.write("Time,Flow,Total\n" + body)
             messagebox.showinfo("Saved", f"Data exported to:\n{fn}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -1293,15 +2042,17 @@ class FlowDashboard:
     # ==================== CLEANUP ====================
     def _cleanup(self):
         self.running = False
+        self.sensor_wake.set()
         try:
             if self.update_after_id:
                 self.root.after_cancel(self.update_after_id)
-            if self.graph_after_id:
-                self.root.after_cancel(self.graph_after_id)
         except Exception:
             pass
         if self.sensor.connected:
             self.sensor.disconnect()
+        # Write out any buffered log rows (_exit_now ends with os._exit)
+        self._close_log()
+        self._flush_hour_summary()
         # Close logs window if open
         try:
             if self.logs_win and getattr(self.logs_win, "top", None):